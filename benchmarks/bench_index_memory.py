@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Compare memory used by error dictionary and compact error index.
+
+Run from checkout as ``PYTHONPATH=. python benchmarks/bench_index_memory.py
+[number of errors]``, ``PYTHONPATH`` is not needed when the package is
+installed.
+"""
+
+import random
+import sys
+import tracemalloc
+
+from rpmlint_list import rpmlint_list
+
+TAGS = ["no-documentation", "no-manual-page-for-binary", "zero-length",
+        "non-standard-dir-perm", "summary-ended-with-dot", "spelling-error"]
+
+
+def generate_errors(count, seed=0):
+    """Generate deterministic list of errors with fresh strings, as they
+    come out of the parser."""
+    generator = random.Random(seed)
+    packages = max(count // 20, 1)
+    for _ in range(count):
+        package = generator.randrange(packages)
+        yield (
+            "package{}.x86_64".format(package),
+            generator.choice("EW"),
+            generator.choice(TAGS),
+            "/usr/share/package{}/file{}".format(
+                package, generator.randrange(5)))
+
+
+def measure(function, count):
+    tracemalloc.start()
+    result = function(generate_errors(count))
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main(count=500000):
+    for name, function in (
+            ("dict", rpmlint_list.get_error_dictionary),
+            ("index", rpmlint_list.get_error_index)):
+        size = measure(function, count)
+        print("{:>6}: {:>8.1f} MiB".format(name, size / 2.0 ** 20))
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:2]])
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Compare speed of rpmlint line parser with the former regex approach.
+
+Run from checkout as ``PYTHONPATH=. python benchmarks/bench_line_parser.py
+[number of lines]``, ``PYTHONPATH`` is not needed when the package is
+installed.
+"""
+
+import re
+import sys
+import timeit
+
+from rpmlint_list import rpmlint_list
+
+LINES = [
+    "foo.x86_64: W: no-documentation",
+    "foo-devel.x86_64: W: no-manual-page-for-binary foo-config",
+    "bar.noarch: E: non-standard-dir-perm /usr/share/bar 775",
+    "bar.src: W: summary-ended-with-dot ---",
+    "baz-libs.aarch64: E: shlib-with-non-pic-code /usr/lib64/libbaz.so.1",
+]
+
+
+def regex_parse(text):
+    """Parser used before the dedicated line parser."""
+    pattern = re.compile(r"(.*):\s(.):\s([^\s]+)\s(.*)")
+    pattern1 = re.compile("^-+$")
+    pattern2 = re.compile("^$")
+    error_list = pattern.findall(text)
+    for error_idx in range(len(error_list)):
+        error_list[error_idx] = [
+            pattern2.sub(
+                "-", pattern1.sub("-", x)) for x in error_list[error_idx]]
+    return error_list
+
+
+def line_parse(text):
+    """Current parser."""
+    error_list = []
+    for line in text.splitlines():
+        error = rpmlint_list.parse_error_line(line)
+        if error is not None:
+            error_list.append(error)
+    return error_list
+
+
+def main(count=200000):
+    text = "\n".join(LINES[i % len(LINES)] for i in range(count))
+    for name, function in (("regex", regex_parse), ("line", line_parse)):
+        seconds = min(timeit.repeat(
+            lambda: function(text), number=1, repeat=3))
+        print("{:>6}: {:>12,.0f} lines/sec".format(name, count / seconds))
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:2]])
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Measure time of importing of command line interface.
+
+Run as ``python benchmarks/bench_startup.py [target in milliseconds]``. The
+best of several runs of ``python -X importtime`` is compared with the target
+and the script fails when it is exceeded. The slowest imports are printed
+to show what should be imported lazily.
+"""
+
+import os
+import subprocess
+import sys
+
+MODULE = "rpmlint_list.cli"
+RUNS = 5
+# Milliseconds, click itself takes about a third of it.
+TARGET = 100
+SLOWEST = 10
+
+
+def import_times():
+    """Get dictionary with cumulative import time of every module imported
+    by `MODULE` in microseconds."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+    output = subprocess.check_output(
+        [sys.executable, "-X", "importtime", "-c", "import " + MODULE],
+        stderr=subprocess.STDOUT, env=env).decode("utf-8")
+    times = {}
+    for line in output.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            times[fields[2].strip()] = int(fields[1])
+        if fields[-1] == " site":
+            # modules imported by interpreter startup
+            times = {}
+    return times
+
+
+def main(target=TARGET):
+    runs = [import_times() for _ in range(RUNS)]
+    best = min(runs, key=lambda x: x[MODULE])
+    for module, time in sorted(
+            best.items(), key=lambda x: -x[1])[:SLOWEST]:
+        print("{:>8.1f} ms  {}".format(time / 1000.0, module))
+    total = best[MODULE] / 1000.0
+    print("import {}: {:.1f} ms (target {} ms)".format(MODULE, total, target))
+    return 0 if total <= target else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[float(x) for x in sys.argv[1:2]]))
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Deterministic generator of synthetic rpmlint reports in JUnit XML.
+
+Run as ``python benchmarks/synthetic.py [number of findings] > report.xml``.
+"""
+
+import io
+import random
+import sys
+
+from xml.sax.saxutils import escape
+
+TAGS = ["no-documentation", "no-manual-page-for-binary", "zero-length",
+        "non-standard-dir-perm", "summary-ended-with-dot", "spelling-error",
+        "files-duplicate", "hidden-file-or-dir",
+        "devel-file-in-non-devel-package",
+        "shlib-policy-missing-suffix", "non-executable-script",
+        "obsolete-not-provided", "incoherent-version-in-changelog"]
+# Few tags are reported for most of the packages as in real reports.
+WEIGHTS = [1.0 / (x + 1) for x in range(len(TAGS))]
+SUFFIXES = ["", "-devel", "-libs", "-doc", "-lang"]
+ARCHITECTURES = ["x86_64", "noarch", "i586"]
+FINDINGS_PER_PACKAGE = 20
+
+
+def parse_count(value):
+    """Parse number of findings with optional ``K`` or ``M`` suffix."""
+    value = value.strip().upper()
+    multiplier = {"K": 10 ** 3, "M": 10 ** 6}.get(value[-1:], 1)
+    if multiplier > 1:
+        value = value[:-1]
+    return int(value) * multiplier
+
+
+def iter_testcases(count, seed=0):
+    """Generate tupples with name of source package and lines of findings.
+    The same count and seed produce always the same findings.
+
+    Args:
+        count(int): number of findings.
+        seed(int): seed of random generator.
+    """
+    generator = random.Random(seed)
+    package = 0
+    while count > 0:
+        size = min(generator.randint(1, 2 * FINDINGS_PER_PACKAGE), count)
+        count -= size
+        name = "package{}".format(package)
+        architecture = generator.choice(ARCHITECTURES)
+        lines = []
+        for tag in generator.choices(TAGS, WEIGHTS, k=size):
+            lines.append("{}{}.{}: {}: {} /usr/share/{}/file{}".format(
+                name, generator.choice(SUFFIXES), architecture,
+                generator.choice("EW"), tag, name, generator.randrange(100)))
+        yield name, lines
+        package += 1
+
+
+def write_report(stream, count, seed=0):
+    """Write synthetic report with count findings into binary stream.
+
+    Args:
+        stream: binary file-like object.
+        count(int): number of findings.
+        seed(int): seed of random generator.
+    """
+    stream.write(b'<?xml version="1.0" encoding="UTF-8"?>\n<testsuite>\n')
+    for name, lines in iter_testcases(count, seed):
+        stream.write('  <testcase name="{}">\n    <failure>{}</failure>\n'
+                     '  </testcase>\n'.format(
+                         name, escape("\n".join(lines))).encode("utf-8"))
+    stream.write(b"</testsuite>\n")
+
+
+def generate_report(count, seed=0):
+    """Get synthetic report with count findings as bytes."""
+    stream = io.BytesIO()
+    write_report(stream, count, seed)
+    return stream.getvalue()
+
+
+if __name__ == "__main__":
+    write_report(
+        getattr(sys.stdout, "buffer", sys.stdout),
+        parse_count(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Benchmarks of parsing of reports and generating of web application.
+
+Run as ``python -m pytest benchmarks``. Reports with 1K findings are used
+by default, other sizes are selected by environment variable
+``RPMLINT_LIST_BENCHMARK_SIZES``, e.g. ``1K,100K,10M``. Peak memory of every
+benchmark is stored in ``extra_info`` of its results.
+"""
+
+import os
+import tracemalloc
+
+import pytest
+
+from rpmlint_list import rpmlint_list
+
+import synthetic
+
+pytest.importorskip("pytest_benchmark")
+
+SIZES = [synthetic.parse_count(x) for x in os.environ.get(
+    "RPMLINT_LIST_BENCHMARK_SIZES", "1K").split(",")]
+# Bigger reports are measured only once, they take minutes.
+ROUNDS_LIMIT = 10 ** 5
+
+
+def measure(benchmark, function, *args):
+    """Measure peak memory of function and then its time."""
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    benchmark.extra_info["peak_memory_mib"] = peak / 2.0 ** 20
+    if benchmark.extra_info["count"] >= ROUNDS_LIMIT:
+        return benchmark.pedantic(function, args, rounds=1, iterations=1)
+    return benchmark(function, *args)
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=str)
+def report(request, tmp_path_factory):
+    path = tmp_path_factory.mktemp("report") / "report.xml"
+    with open(str(path), "wb") as report_file:
+        synthetic.write_report(report_file, request.param)
+    return request.param, str(path)
+
+
+@pytest.fixture(scope="module")
+def error_dictionary(report):
+    return rpmlint_list.get_error_dictionary(
+        rpmlint_list.iter_error_list(report[1]))
+
+
+@pytest.fixture
+def count(benchmark, report):
+    benchmark.extra_info["count"] = report[0]
+    return report[0]
+
+
+def test_get_error_list(benchmark, report, count):
+    errors = measure(benchmark, rpmlint_list.get_error_list, report[1])
+    assert len(errors) == count
+
+
+def test_get_error_dictionary(benchmark, report, count):
+    errors = rpmlint_list.get_error_list(report[1])
+    measure(benchmark, rpmlint_list.get_error_dictionary, errors)
+
+
+def test_generate_html_list(benchmark, error_dictionary, count):
+    generator = rpmlint_list.HTMLGenerator(error_dictionary)
+    assert measure(benchmark, generator.generate_html_list)
+
+
+def test_generate_details(benchmark, error_dictionary, count, tmp_path):
+    generator = rpmlint_list.HTMLGenerator(error_dictionary)
+    measure(
+        benchmark, generator.generate_details, error_dictionary,
+        str(tmp_path))
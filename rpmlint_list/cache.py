@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+"""On-disk cache of parsed reports."""
+
+import hashlib
+import json
+import os
+import pickle
+from rpmlint_list.index import INDEX_FORMAT, LOAD_ERRORS, ErrorIndex
+
+DEFAULT_MAX_SIZE = 1024 * 2 ** 20
+
+
+class ReportCache(object):
+    """Cache of error indexes parsed from reports.
+
+    Every entry consists of `<key>.json` with validators of the report
+    (ETag, Last-Modified or SHA-256 of its content) and `<key>.pickle` with
+    the index. When total size of entries exceeds `max_size`, least
+    recently used entries are removed.
+
+    Args:
+        directory(str): path to directory with cache, it is created if it
+            doesn't exist.
+        max_size(int): Maximal size of cache in bytes.
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+    def get_key(self, source, priority_info=None):
+        """Get key of cache entry, it depends also on format of index, so
+        entries stored by other versions are not used.
+
+        Args:
+            source(str): URL or path of report.
+            priority_info(dict): priorities used for the index.
+        """
+        content = json.dumps(
+            [INDEX_FORMAT, source, priority_info], sort_keys=True,
+            default=repr)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _get_path(self, key, suffix):
+        return os.path.join(self.directory, key + suffix)
+
+    def get_validators(self, key):
+        """Get dictionary with validators of cached report or None if report
+        is not cached.
+
+        Args:
+            key(str): key of cache entry.
+        """
+        if not os.path.exists(self._get_path(key, ".pickle")):
+            return None
+        try:
+            with open(self._get_path(key, ".json")) as validators_file:
+                return json.load(validators_file)
+        except (EnvironmentError, ValueError):
+            return None
+
+    def load(self, key):
+        """Load cached index or None if the entry was evicted meanwhile or
+        it cannot be loaded.
+
+        Args:
+            key(str): key of cache entry.
+        """
+        path = self._get_path(key, ".pickle")
+        try:
+            with open(path, "rb") as index_file:
+                error_index = pickle.load(index_file)
+            os.utime(path, None)
+        except (FileNotFoundError,) + LOAD_ERRORS:
+            return None
+        if not isinstance(error_index, ErrorIndex):
+            return None
+        return error_index
+
+    def _write(self, path, content, mode):
+        temporary_path = "{}.{}.tmp".format(path, os.getpid())
+        with open(temporary_path, mode) as file_o:
+            if mode == "wb":
+                pickle.dump(content, file_o, pickle.HIGHEST_PROTOCOL)
+            else:
+                json.dump(content, file_o)
+        os.rename(temporary_path, path)
+
+    def store(self, key, validators, error_index, evict=True):
+        """Store index and validators of its report into cache.
+
+        Args:
+            key(str): key of cache entry.
+            validators(dict): ETag, Last-Modified or hash of the report.
+            error_index(ErrorIndex): index created from the report.
+            evict(bool): Remove least recently used entries afterwards.
+                Processes storing entries in parallel should not evict,
+                `evict` is called once they finish.
+        """
+        self._write(self._get_path(key, ".pickle"), error_index, "wb")
+        self._write(self._get_path(key, ".json"), validators, "w")
+        if evict:
+            self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until size of cache is lower
+        than maximal size. Entries removed meanwhile by another process are
+        skipped."""
+        entries = []
+        total_size = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".pickle"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name[:-7]))
+            total_size += stat.st_size
+        for _, size, key in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            for suffix in (".pickle", ".json"):
+                try:
+                    os.remove(self._get_path(key, suffix))
+                except FileNotFoundError:
+                    pass
+            total_size -= size
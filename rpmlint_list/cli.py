@@ -3,37 +3,407 @@
 """Console script for rpmlint_list."""
 
 import click
+import functools
 import json
-import rpmlint_list
+import os
+import sys
+from rpmlint_list import rpmlint_list
+from rpmlint_list import timing
+from rpmlint_list.cache import ReportCache
+from rpmlint_list.index import ErrorIndex
 
+# Modules needed only by some commands or outputs are imported by them, so
+# the command line starts fast.
 
-@click.command()
+
+class DefaultGroup(click.Group):
+    """Group of commands that invokes default command when the first
+    argument is not name of a command."""
+
+    def __init__(self, *args, **kwargs):
+        self.default_command = kwargs.pop('default_command')
+        super(DefaultGroup, self).__init__(*args, **kwargs)
+
+    def parse_args(self, ctx, args):
+        if args and args[0] not in self.commands and\
+                args[0] not in ctx.help_option_names:
+            args = [self.default_command] + list(args)
+        return super(DefaultGroup, self).parse_args(ctx, args)
+
+
+def instrument(command):
+    """Decorator adding options that report wall time of stages and other
+    metrics of command or save its profile."""
+    @click.option('--timings', 'show_timings', is_flag=True,
+                  help='Print wall time of stages, bytes downloaded,\
+ findings per second, peak RSS and number of written files to stderr.')
+    @click.option('--timings_json',
+                  help='Path where will be saved timings as JSON.')
+    @click.option('--profile',
+                  help='Path where will be saved cProfile statistics.')
+    @functools.wraps(command)
+    def wrapper(show_timings, timings_json, profile, **kwargs):
+        if profile:
+            import cProfile
+            profiler = cProfile.Profile()
+        else:
+            profiler = None
+        with timing.collect() as timings:
+            if profiler:
+                profiler.enable()
+            try:
+                return command(**kwargs)
+            finally:
+                if profiler:
+                    profiler.disable()
+                    profiler.dump_stats(profile)
+                if show_timings:
+                    click.echo(timings.format(), err=True)
+                if timings_json:
+                    with open(timings_json, "w") as timings_file:
+                        json.dump(timings.get_record(), timings_file,
+                                  sort_keys=True)
+    return wrapper
+
+
+def fetch_options(command):
+    """Decorator adding options of downloads of reports."""
+    @click.option('--timeout', default=rpmlint_list.DEFAULT_TIMEOUT,
+                  type=float,
+                  help='Seconds to wait for connection and for every chunk\
+ of report. {} is default.'.format(rpmlint_list.DEFAULT_TIMEOUT))
+    @click.option('--retries', default=rpmlint_list.DEFAULT_RETRIES,
+                  type=int,
+                  help='Number of retries of failed downloads with\
+ exponential backoff. {} is default.'.format(rpmlint_list.DEFAULT_RETRIES))
+    @functools.wraps(command)
+    def wrapper(timeout, retries, **kwargs):
+        rpmlint_list.set_fetch_options(timeout, retries)
+        return command(**kwargs)
+    return wrapper
+
+
+@click.group(cls=DefaultGroup, default_command='report')
+def main():
+    """Creates reverse indexes for rpmlint errors. Command `report` is used
+    when no command is provided."""
+
+
+@main.command()
+@instrument
+@fetch_options
 @click.option('--list_format', '-f', default="none",
-              help='Format can be `json`, `html` or `none`. `none`\
-is default.')
+              help='Format can be `json`, `package_json`, `ndjson`, `summary`,\
+ `html` or `none`. `none` is default.')
 @click.option('--details_path', '-d',
               help='Path where will be generated web application.')
 @click.option('--priority_path', '-p',
               help='Path with priority configuration.')
-@click.argument('url')
-def main(list_format, details_path, priority_path, url):
-    """Creates reverse index list from provided URL with XML"""
+@click.option('--workers', '-j', type=int,
+              help='Number of processes used for parsing of reports and\
+ generating of web application.')
+@click.option('--incremental', '-i', is_flag=True,
+              help='Rewrite only pages of web application with changed\
+ content.')
+@click.option('--page_size', default=1000, type=int,
+              help='Maximal number of packages on one page of error\
+ details. 1000 is default, 0 disables splitting into pages.')
+@click.option('--cache_dir', '-c',
+              help='Path to directory with cache of parsed reports.')
+@click.option('--cache_size', default=1024, type=int,
+              help='Maximal size of cache in MiB. 1024 is default.')
+@click.option('--index_path', '-s',
+              help='Path where will be saved index for command `update`.')
+@click.option('--sqlite_path',
+              help='Path where will be saved SQLite database for command\
+ `query`.')
+@click.argument('urls', nargs=-1, required=True, metavar='URL...')
+def report(list_format, details_path, priority_path, workers, incremental,
+           page_size, cache_dir, cache_size, index_path, sqlite_path, urls):
+    """Creates reverse index list from provided URLs or paths with XML"""
     if priority_path:
         priority_info = rpmlint_list.load_priority_info(priority_path)
     else:
         priority_info = None
-    error_list = rpmlint_list.get_error_list(url)
-    error_dictionary = rpmlint_list.get_error_dictionary(
-        error_list,
-        priority_info)
+    if cache_dir:
+        error_index = rpmlint_list.get_cached_error_index(
+            urls, ReportCache(cache_dir, cache_size * 2 ** 20),
+            priority_info, workers)
+    else:
+        # Packages of testcases are needed only by `update` of saved index.
+        testcases = {} if index_path else None
+        error_list = rpmlint_list.iter_error_lists(urls, workers, testcases)
+        if list_format == 'ndjson' and not (
+                details_path or index_path or sqlite_path):
+            with timing.stage("parse"):
+                rpmlint_list.write_ndjson(
+                    sys.stdout, error_list, priority_info)
+            return
+        error_index = rpmlint_list.get_error_index(
+            error_list, priority_info, testcases)
+    if index_path:
+        with timing.stage("save"):
+            error_index.save(index_path)
+    if sqlite_path:
+        from rpmlint_list.store import SQLiteStore
+        with timing.stage("save"), SQLiteStore(sqlite_path) as store:
+            store.write(error_index)
+    if list_format in ('html', 'json') or details_path:
+        with timing.stage("dictionary"):
+            error_dictionary = error_index.to_dict()
     if list_format == 'html' or details_path:
-        generator = rpmlint_list.HTMLGenerator(error_dictionary)
-    if list_format == 'html':
-        click.echo(generator.generate_html_list())
-    elif list_format == 'json':
-        click.echo(json.dumps(error_dictionary))
+        from rpmlint_list.html import HTMLGenerator
+        generator = HTMLGenerator(error_dictionary)
+    with timing.stage("output"):
+        if list_format == 'html':
+            generator.write_html_list(sys.stdout)
+            sys.stdout.write('\n')
+        elif list_format == 'json':
+            click.echo(json.dumps(error_dictionary))
+        elif list_format == 'package_json':
+            click.echo(json.dumps(error_index.to_package_dict()))
+        elif list_format == 'ndjson':
+            rpmlint_list.write_ndjson(
+                sys.stdout, error_index.iter_errors(), priority_info)
+        elif list_format == 'summary':
+            click.echo(json.dumps(error_index.get_summary()))
     if details_path:
-        generator.generate_details(error_dictionary, details_path)
+        generator.generate_details(
+            error_dictionary, details_path, error_index.to_package_dict(),
+            workers, incremental, summary=error_index.get_summary(),
+            page_size=page_size)
+
+
+@main.command()
+@instrument
+@fetch_options
+@click.option('--details_path', '-d',
+              help='Path with web application where will be regenerated\
+ pages of changed errors and packages.')
+@click.option('--priority_path', '-p',
+              help='Path with priority configuration, priorities of all\
+ errors in index are recomputed.')
+@click.option('--workers', '-j', type=int,
+              help='Number of processes used for parsing of reports and\
+ generating of web application.')
+@click.option('--page_size', default=1000, type=int,
+              help='Maximal number of packages on one page of error\
+ details. 1000 is default, 0 disables splitting into pages.')
+@click.argument('index_path')
+@click.argument('urls', nargs=-1, required=True, metavar='URL...')
+def update(details_path, priority_path, workers, page_size, index_path,
+           urls):
+    """Replaces errors of packages present in provided reports in index
+    saved by `report --index_path`, also packages checked without errors
+    are cleared"""
+    if os.path.exists(index_path):
+        try:
+            error_index = ErrorIndex.load(index_path)
+        except ValueError as error:
+            raise click.BadParameter(str(error), param_hint='INDEX_PATH')
+    else:
+        error_index = ErrorIndex()
+    if priority_path:
+        error_index.set_priority_info(
+            rpmlint_list.load_priority_info(priority_path))
+    testcases = {}
+    with timing.stage("parse"):
+        changed_errors, packages = error_index.replace_packages(
+            rpmlint_list.iter_error_lists(urls, workers, testcases),
+            testcases)
+    if priority_path:
+        # Pages of all errors show their priorities.
+        changed_errors.update(
+            (x, y) for x in error_index.get_severities()
+            for y in error_index.get_errors(x))
+    with timing.stage("save"):
+        error_index.save(index_path)
+    if details_path:
+        with timing.stage("dictionary"):
+            error_dictionary = error_index.to_dict(changed_errors)
+            package_dictionary = error_index.to_package_dict(packages)
+        from rpmlint_list.html import HTMLGenerator
+        generator = HTMLGenerator(error_dictionary)
+        generator.generate_details(
+            error_dictionary, details_path, package_dictionary, workers,
+            errors=changed_errors, packages=packages,
+            summary=error_index.get_summary(), page_size=page_size,
+            package_list=error_index.get_package_list())
+
+
+@main.command()
+@click.option('--error', '-e',
+              help='Show packages where error was reported.')
+@click.option('--package', '-k',
+              help='Show errors reported for package.')
+@click.option('--top', '-t', type=int,
+              help='Show given number of errors reported for the most\
+ packages.')
+@click.argument('sqlite_path')
+def query(error, package, top, sqlite_path):
+    """Queries SQLite database saved by `report --sqlite_path`"""
+    if not os.path.exists(sqlite_path):
+        raise click.BadParameter(
+            'No such file: {}'.format(sqlite_path), param_hint='SQLITE_PATH')
+    from rpmlint_list.store import SQLiteStore
+    with SQLiteStore(sqlite_path) as store:
+        if error:
+            rows = [(x,) for x in store.get_packages(error)]
+        elif package:
+            rows = store.get_package_errors(package)
+        else:
+            rows = store.get_top_errors(top or 10)
+        for row in rows:
+            click.echo('\t'.join(str(x) for x in row))
+
+
+@main.command()
+@fetch_options
+@click.option('--list_format', '-f', default="json",
+              help='Format can be `json`, `package_json` or `html`. `json`\
+ is default.')
+@click.option('--priority_path', '-p',
+              help='Path with priority configuration.')
+@click.argument('old_url')
+@click.argument('new_url')
+def diff(list_format, priority_path, old_url, new_url):
+    """Shows errors added and removed between two reports"""
+    if priority_path:
+        priority_info = rpmlint_list.load_priority_info(priority_path)
+    else:
+        priority_info = None
+    error_diff = rpmlint_list.get_error_diff(
+        rpmlint_list.iter_error_lists([old_url]),
+        rpmlint_list.iter_error_lists([new_url]),
+        priority_info)
+    if list_format == 'html':
+        from rpmlint_list.html import HTMLGenerator
+        HTMLGenerator({}).write_diff_list(sys.stdout, error_diff)
+        sys.stdout.write('\n')
+    elif list_format == 'package_json':
+        click.echo(json.dumps({
+            "added": rpmlint_list.get_package_dictionary(
+                error_diff["added"]),
+            "removed": rpmlint_list.get_package_dictionary(
+                error_diff["removed"]),
+            "unchanged": error_diff["unchanged"]}))
+    else:
+        click.echo(json.dumps(error_diff))
+
+
+def generate_served_details(error_index, details_path, workers=None,
+                            page_size=None):
+    """Generate web application of index into a new directory next to
+    details_path and then replace symbolic link details_path by link to the
+    new directory, so served pages are never partially written. Previous
+    directory is copied first and only changed pages are rendered. It is
+    kept for requests still reading it, older directories are removed.
+
+    Args:
+        error_index(ErrorIndex): index of errors.
+        details_path(str): path of symbolic link to web application.
+        workers(int): Maximal number of processes.
+        page_size(int): Maximal number of packages on one page of error
+            details.
+
+    Returns:
+        str: path of the new directory.
+    """
+    import glob
+    import shutil
+    import tempfile
+    from rpmlint_list.html import HTMLGenerator
+
+    parent, name = os.path.split(os.path.abspath(details_path))
+    prefix = name + ".serve-"
+    previous = os.path.realpath(details_path)\
+        if os.path.islink(details_path) else None
+    directory = tempfile.mkdtemp(prefix=prefix, dir=parent)
+    if previous and os.path.isdir(previous):
+        os.rmdir(directory)
+        shutil.copytree(previous, directory)
+    os.chmod(directory, 0o755)
+    error_dictionary = error_index.to_dict()
+    HTMLGenerator(error_dictionary).generate_details(
+        error_dictionary, directory, error_index.to_package_dict(), workers,
+        True, summary=error_index.get_summary(), page_size=page_size)
+    link = directory + ".link"
+    os.symlink(os.path.basename(directory), link)
+    os.replace(link, details_path)
+    for old in glob.glob(os.path.join(parent, glob.escape(prefix) + "*")):
+        if old not in (directory, previous) and not os.path.islink(old):
+            shutil.rmtree(old, ignore_errors=True)
+    return directory
+
+
+@main.command()
+@fetch_options
+@click.option('--host', default='127.0.0.1',
+              help='Address where the server listens. 127.0.0.1 is\
+ default.')
+@click.option('--port', default=8000, type=int,
+              help='Port where the server listens. 8000 is default.')
+@click.option('--interval', default=300.0, type=float,
+              help='Seconds between reloads of reports. 300 is default, 0\
+ disables reloading.')
+@click.option('--details_path', '-d',
+              help='Path of symbolic link to served web application, it\
+ is generated into directories next to it.')
+@click.option('--priority_path', '-p',
+              help='Path with priority configuration.')
+@click.option('--workers', '-j', type=int,
+              help='Number of processes used for parsing of reports and\
+ generating of web application.')
+@click.option('--page_size', default=1000, type=int,
+              help='Maximal number of packages on one page of error\
+ details. 1000 is default, 0 disables splitting into pages.')
+@click.option('--cache_dir', '-c',
+              help='Path to directory with cache of parsed reports.')
+@click.option('--cache_size', default=1024, type=int,
+              help='Maximal size of cache in MiB. 1024 is default.')
+@click.argument('urls', nargs=-1, required=True, metavar='URL...')
+def serve(host, port, interval, details_path, priority_path, workers,
+          page_size, cache_dir, cache_size, urls):
+    """Serves JSON API and web application from index kept in memory and
+    reloaded periodically from provided URLs or paths with XML"""
+    from rpmlint_list.server import IndexHolder, IndexServer
+
+    if details_path and os.path.exists(details_path) and\
+            not os.path.islink(details_path):
+        raise click.BadParameter(
+            'Path exists and it is not a symbolic link: {}'.format(
+                details_path), param_hint='--details_path')
+    if priority_path:
+        priority_info = rpmlint_list.load_priority_info(priority_path)
+    else:
+        priority_info = None
+    report_cache = ReportCache(cache_dir, cache_size * 2 ** 20)\
+        if cache_dir else None
+
+    def load():
+        if report_cache:
+            error_index = rpmlint_list.get_cached_error_index(
+                urls, report_cache, priority_info, workers)
+        else:
+            error_index = rpmlint_list.get_error_index(
+                rpmlint_list.iter_error_lists(urls, workers), priority_info)
+        if details_path:
+            return error_index, generate_served_details(
+                error_index, details_path, workers, page_size)
+        return error_index
+
+    holder = IndexHolder(load, interval)
+    server = IndexServer((host, port), holder)
+    holder.start()
+    click.echo('Serving on http://{}:{}/'.format(*server.server_address[:2]),
+               err=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        holder.stop()
+        server.server_close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,799 @@
+# -*- coding: utf-8 -*-
+
+"""Generating of html pages and web application from dictionaries of
+errors."""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+from rpmlint_list import __version__
+from rpmlint_list import timing
+from rpmlint_list.rpmlint_list import (
+    MANIFEST, SEARCH_CHARACTERS, SEARCH_DIRECTORY, SEARCH_PREFIX_LENGTH,
+    SOURCES, STATIC_DIRECTORY, get_error_statistics, get_package_dictionary)
+
+SEARCH_TAGS = "tags.js"
+SEARCH_TAGS_PREFIX = "rpmlintSearch.tags("
+
+
+def get_error_page_name(error, page=1):
+    """Get name of file with page of error details.
+
+    Args:
+        error(str): name of error.
+        page(int): number of page.
+    """
+    if page == 1:
+        return "{}.html".format(error)
+    return "{}-page{}.html".format(error, page)
+
+
+def get_search_shard_name(package):
+    """Get name of shard of search index containing package. It has to
+    match `getShardName` of search.js.
+
+    Args:
+        package(str): name of package.
+    """
+    return "".join(
+        x if x in SEARCH_CHARACTERS else "_"
+        for x in package[:SEARCH_PREFIX_LENGTH].lower())
+
+
+def get_search_shard_prefix(name):
+    """Get beginning of file of search index shard before its packages.
+
+    Args:
+        name(str): name of shard.
+    """
+    return "rpmlintSearch.load({}, ".format(json.dumps(name))
+
+
+def read_search_file(file_path, prefix):
+    """Get data of file of search index or None if it does not exist.
+
+    Args:
+        file_path(str): path of the file.
+        prefix(str): beginning of the file before its data.
+    """
+    if not os.path.exists(file_path):
+        return None
+    with io.open(file_path, encoding="utf-8") as file_o:
+        content = file_o.read()
+    if not content.startswith(prefix) or not content.endswith(");\n"):
+        return None
+    return json.loads(content[len(prefix):-len(");\n")])
+
+
+def get_search_index(error_dictionary, package_dictionary, error_pages):
+    """Creates search index of packages split into shards by prefix of
+    package name.
+
+    Args:
+        error_dictionary(dict): dictionary from `get_error_dictionary`.
+        package_dictionary(dict): dictionary from `get_package_dictionary`.
+        error_pages(function): function returning relative path of page
+            of error from its severity and name.
+
+    Returns:
+        tuple: list of severity, name and page of errors and dictionary
+            where key is name of shard and value is dictionary of package
+            names and positions of their errors in the list.
+    """
+    tags = []
+    positions = {}
+    for error_type in sorted(error_dictionary):
+        for error in sorted(error_dictionary[error_type]):
+            positions[error_type, error] = len(tags)
+            tags.append([
+                error_type, error,
+                error_pages(error_type, error).replace(os.sep, "/")])
+    shards = {}
+    for package, package_info in package_dictionary.items():
+        shards.setdefault(get_search_shard_name(package), {})[package] =\
+            sorted(
+                positions[error_type, error]
+                for error_type, errors in package_info["errors"].items()
+                for error in errors)
+    return tags, shards
+
+
+def split_error_info(error_info, page_size=None):
+    """Split details of error into list of parts with at most page_size
+    packages. Packages of one detail can span more parts. Sources are not
+    rendered in details, so they are left out of the parts, and priorities
+    of packages are limited to packages of the part.
+
+    Args:
+        error_info(dict): details and priority of error from
+            `get_error_dictionary`.
+        page_size(int): Maximal number of packages in one part. Details
+            are not split if it is not provided.
+    """
+    if not page_size:
+        return [error_info]
+    findings = [
+        (name, package) for name, packages in error_info["detail"].items()
+        for package in packages]
+    package_priorities = error_info.get("package_priorities") or {}
+    parts = []
+    for position in range(0, len(findings), page_size):
+        part = dict(
+            (x, y) for x, y in error_info.items()
+            if x not in ("sources", "package_priorities"))
+        part["detail"] = {}
+        for name, package in findings[position:position + page_size]:
+            part["detail"].setdefault(name, []).append(package)
+            if package in package_priorities:
+                part.setdefault("package_priorities", {})[package] =\
+                    package_priorities[package]
+        parts.append(part)
+    return parts or [error_info]
+
+
+class HTMLGenerator:
+    """Handle html output for provided dictionary/list.
+
+    Methods with `write_` prefix write html into provided file-like object
+    piece by piece, methods with `generate_` prefix return it as string.
+    """
+
+    def __init__(self, error_dictionary):
+        self.error_dictionary = error_dictionary
+        self.output = ""
+
+    def nice_error_format(self, detail_dictionary):
+        """Get Html 2 level list with error details and relevant packages.
+
+        Args:
+            detail_dictionary(dict): key is error and values are packages.
+        """
+        output = []
+        for detail in detail_dictionary.keys():
+            output.append("<h4>{}</h4><ul><li>".format(detail))
+            output.append("</li><li>".join(detail_dictionary[detail]))
+            output.append("</li></ul>")
+        return "".join(output)
+
+    def convert_dictionary_to_list(self, obj, indent=0, error_type="Warning",
+                                   stream=None):
+        """Creates recursively html list structure from dictionary/list.
+
+        Args:
+            obj: dictionary, list or string that is turned into a html.
+            stream: file-like object where html is written. If it is not
+                provided, html is appended to `output` attribute.
+        """
+        if stream is None:
+            stream = io.StringIO()
+            self.convert_dictionary_to_list(obj, indent, error_type, stream)
+            self.output += stream.getvalue()
+            return
+        if obj:
+            if type(obj) is dict:
+                for k, v in obj.items():
+                    if indent == 0:
+                        error_type = k
+                    output = [
+                        '\n{}<li><a class="item" href="#">{}</a>'.format(
+                            '  ' * (indent+1), k)]
+
+                    # Add link to error description
+                    if indent == 2 and error_type == "Error":
+                        output.append(
+                            " <a href='http://wiki.rosalab.ru/en/"
+                            "index.php/Rpmlint_Errors#{}' target="
+                            "'_blank'>details</a>".format(k))
+                    output.append('\n{}<ul>'.format('  ' * (indent+1)))
+                    stream.write("".join(output))
+                    self.convert_dictionary_to_list(
+                        v, indent+2, error_type, stream)
+                    stream.write('\n{}</ul>\n{}</li>'.format(
+                        '  ' * (indent+1), '  ' * (indent+1)))
+            elif type(obj) is list:
+                for k, v in enumerate(obj):
+                    self.convert_dictionary_to_list(
+                        v, indent+1, error_type, stream)
+            elif type(obj) is str:
+                stream.write('\n{}<li>{}</li>'.format('  ' * (indent+1), obj))
+
+    def get_html_header(self, position=""):
+        """Generate string containing html header.
+
+        Args:
+            position(str): relative or absolute position of sources."""
+        return """<html>
+    <head><title>Rpmlint list</title>
+<meta charset=\"utf-8\" />
+<meta name=\"viewport\" content=\"initial-scale=1.0;
+maximum-scale=1.0; width=device-width;\">
+<link rel=\"stylesheet\" href=\"{}sources/style.css\">
+<script src=\"{}sources/sorttable.js\"></script>
+<style>th{{background-color:#e0e0e0;color:#000;}}
+table{{margin: 50 50 50 50}}
+h1{{margin-left: 50}}</style>
+    </head>
+    <body>""".format(position, position)
+
+    def get_html_footer(self, scripts=None):
+        """Geenrate string containing html footer.
+
+        Args:
+            scripts(str): String that is put before </body> tag.
+        """
+        if scripts:
+            return """{}
+    </body>
+</html>""".format(scripts)
+        else:
+            return "</body></html>"
+
+    def copy_sources(self, directory):
+        """Copy css and js files distributed with the package into directory.
+
+        Args:
+            directory(str): path to directory with sources.
+        """
+        directory = os.path.join(directory, "sources")
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        for name in SOURCES:
+            shutil.copyfile(
+                os.path.join(STATIC_DIRECTORY, name),
+                os.path.join(directory, name))
+
+    def download_sources(self, directory):
+        """Save css and js files into directory. Kept for compatibility,
+        files are no longer downloaded, see `copy_sources`.
+
+        Args:
+            directory(str): path to directory with sources.
+        """
+        self.copy_sources(directory)
+
+    def write_html_list(self, stream):
+        """Writes html artefacts containing list of packages and for each
+        package list of errors.
+
+        Args:
+            stream: file-like object where html is written.
+        """
+        scripts = """<script type='text/javascript' \
+src="js/CollapsibleLists.js"></script>
+<script>CollapsibleLists.apply()</script>"""
+        stream.write("""{}
+        <ul class="collapsibleList">
+        """.format(self.get_html_header()))
+        self.convert_dictionary_to_list(self.error_dictionary, stream=stream)
+        stream.write("""
+        </ul>
+{}""".format(self.get_html_footer(scripts)))
+
+    def generate_html_list(self):
+        """Generates html artefacts containing list of packages and for each
+        package list of errors.
+        """
+        stream = io.StringIO()
+        self.write_html_list(stream)
+        return stream.getvalue()
+
+    def write_diff_list(self, stream, error_diff):
+        """Writes html artefacts containing lists of errors added and removed
+        between two reports.
+
+        Args:
+            stream: file-like object where html is written.
+            error_diff(dict): result of `get_error_diff`.
+        """
+        stream.write(self.get_html_header())
+        for title, key in (("Added", "added"), ("Removed", "removed")):
+            stream.write("""
+        <h1>{}</h1>
+        <ul class="collapsibleList">
+        """.format(title))
+            self.convert_dictionary_to_list(error_diff[key], stream=stream)
+            stream.write("""
+        </ul>""")
+        stream.write("""
+        <p>Unchanged: {}</p>
+{}""".format(error_diff["unchanged"], self.get_html_footer()))
+
+    def convert_dictionary_to_table(self, error_dictionary, error_type, error):
+        """Generate html table with two columns.
+
+        Args:
+            error_dictionary(dictionary): dictionary where key is rpm package
+                and values are error messages.
+        """
+        packages = {}
+        errors = []
+        for detail in error_dictionary["detail"].keys():
+            error_detail = "{} {}".format(error, detail)
+            errors.append(error_detail)
+            packages[error_detail] = error_dictionary["detail"][detail]
+        if error_type == "Error":
+            url = "https://fedoraproject.org/wiki/ParagNemade/\
+CommonRpmlintErrors#{}".format(error)
+        else:
+            url = None
+        cells = ["<tr><th>Name:</th><td>{}</td></tr>".format(error)]
+        cells.append(
+            "<tr><th>Severity:</th><td>{}</td></tr>".format(error_type))
+        cells.append("<tr><th>Details:</th><td>{}</td></tr>".format(
+            self.nice_error_format(packages)))
+        if url:
+            cells.append("""<tr><th>URL:</th><td><a href=\"{}\">{}</a></td>
+                </tr>""".format(url, url))
+        if error_dictionary["priority"]:
+            cells.append("<tr><th>Priority:</th><td>{}</td></tr>".format(
+                error_dictionary["priority"]))
+        package_priorities = error_dictionary.get("package_priorities")
+        if package_priorities:
+            cells.append(
+                "<tr><th>Priority in packages:</th><td>{}</td></tr>".format(
+                    "<br>".join(
+                        "{}: {}".format(x, package_priorities[x])
+                        for x in sorted(package_priorities))))
+
+        table = "<table class=\"pure-table pure-table-horizontal\">{}</table>"\
+                .format("".join(cells))
+        return table
+
+    def get_pager(self, error, page, page_count):
+        """Generate links to other pages of error details.
+
+        Args:
+            error(str): name of error.
+            page(int): number of current page.
+            page_count(int): number of pages.
+        """
+        links = []
+        for title, target in (
+                ("First", 1), ("Previous", page - 1), ("Next", page + 1),
+                ("Last", page_count)):
+            if 1 <= target <= page_count and target != page:
+                links.append("<a href='{}'>{}</a>".format(
+                    get_error_page_name(error, target), title))
+            else:
+                links.append(title)
+        return "<p>Page {} of {}: {}</p>".format(
+            page, page_count, " | ".join(links))
+
+    def generate_detail(self, error_dictionary, error_type, error, page=1,
+                        page_count=1):
+        """Generates html artefacts containing table with error or warning
+        details.
+
+        Args:
+            error_dictionary(dictionary): dictionary where key is rpm package
+                and values are error messages.
+            page(int): number of page if details are split into pages.
+            page_count(int): number of pages.
+        """
+        table = self.convert_dictionary_to_table(
+            error_dictionary,
+            error_type,
+            error)
+        if page_count > 1:
+            pager = self.get_pager(error, page, page_count)
+            table = "{}{}{}".format(pager, table, pager)
+        # self.convert_dictionary(self.error_dictionary)
+        content = """{}
+        {}
+{}""".format(self.get_html_header("../"), table, self.get_html_footer())
+        return content
+
+    def write_error_list(self, stream, error_dictionary, summary=None):
+        """Write sortable table with errors and their statisctics.
+
+        Args:
+            stream: file-like object where html is written.
+            error_dictionary(dict): dictionary object with information
+                about errors and warnings.
+            summary(dict): statistics of errors from
+                `ErrorIndex.get_summary`. They are counted from
+                error_dictionary if they are not provided.
+        """
+        for error_severity in error_dictionary.keys():
+            stream.write("<h1>{}</h1>".format(error_severity))
+            stream.write("<table class=\"sortable pure-table\"><thead><tr>"
+                         "<th>Name</th><th>Number of packages</th>"
+                         "<th>Number of occurrences</th>"
+                         "<th>Priority</th><th>Details</th></thead><tbody>")
+            for error in error_dictionary[error_severity].keys():
+                if summary:
+                    statistics = summary["errors"][error_severity][error]
+                else:
+                    statistics = get_error_statistics(
+                        error_dictionary[error_severity][error])
+                stream.write("".join((
+                    "<tr><td>{}</td>".format(error),
+                    "<td>{}</td>".format(statistics["packages"]),
+                    "<td>{}</td>".format(statistics["occurrences"]),
+                    "<td>{}</td>".format(statistics["priority"]),
+                    "<td><a href='{}/{}.html'>link</a></td>".format(
+                        error_severity.lower(), error),
+                    "</tr>")))
+            stream.write("</tbody></table>")
+
+    def generate_error_list(self, error_dictionary):
+        """Generate sortable table with errors and their statisctics.
+
+        Args:
+            error_dictionary(dict): dictionary object with information
+                about errors and warnings.
+        """
+        stream = io.StringIO()
+        self.write_error_list(stream, error_dictionary)
+        return stream.getvalue()
+
+    def write_package_list(self, stream, package_dictionary,
+                           package_list=None):
+        """Write sortable table with packages and number of their errors.
+
+        Args:
+            stream: file-like object where html is written.
+            package_dictionary(dict): dictionary where key is package and
+                value contains its source package and errors.
+            package_list(list): tupples with name, source package and number
+                of errors of packages written instead of package_dictionary
+                if it is provided.
+        """
+        stream.write("<h1>Packages</h1>"
+                     "<table class=\"sortable pure-table\"><thead><tr>"
+                     "<th>Name</th><th>Source package</th>"
+                     "<th>Number of errors</th></thead><tbody>")
+        if package_list is None:
+            package_list = []
+            for package in sorted(package_dictionary.keys()):
+                error_count = 0
+                for errors in package_dictionary[package]["errors"].values():
+                    for details in errors.values():
+                        error_count += len(details)
+                package_list.append((
+                    package, package_dictionary[package]["source_package"],
+                    error_count))
+        for package, source_package, error_count in package_list:
+            stream.write("".join((
+                "<tr><td><a href='{}.html'>{}</a></td>".format(
+                    package, package),
+                "<td>{}</td>".format(source_package),
+                "<td>{}</td>".format(error_count),
+                "</tr>")))
+        stream.write("</tbody></table>")
+
+    def generate_package_list(self, package_dictionary):
+        """Generate sortable table with packages and number of their errors.
+
+        Args:
+            package_dictionary(dict): dictionary where key is package and
+                value contains its source package and errors.
+        """
+        stream = io.StringIO()
+        self.write_package_list(stream, package_dictionary)
+        return stream.getvalue()
+
+    def generate_package_detail(self, package, package_info):
+        """Generates html artefacts containing table with all errors and
+        warnings reported for package.
+
+        Args:
+            package(str): name of package.
+            package_info(dict): source package and errors of the package.
+        """
+        output = ["<h1>{}</h1>".format(package)]
+        output.append("<p>Source package: {}</p>".format(
+            package_info["source_package"]))
+        output.append("<table class=\"sortable pure-table\"><thead><tr>"
+                      "<th>Severity</th><th>Name</th><th>Detail</th>"
+                      "</thead><tbody>")
+        for error_type in package_info["errors"].keys():
+            for error, details in package_info["errors"][error_type].items():
+                for detail in details:
+                    output.append("<tr><td>{}</td>".format(error_type))
+                    output.append("<td><a href='../{}/{}.html'>{}</a></td>"
+                                  .format(error_type.lower(), error, error))
+                    output.append("<td>{}</td></tr>".format(detail))
+        output.append("</tbody></table>")
+        return """{}
+        {}
+{}""".format(self.get_html_header("../"), "".join(output),
+             self.get_html_footer())
+
+    def generate_search_page(self):
+        """Generate string containing page with search of packages."""
+        return """{}
+        <h1>Search packages</h1>
+        <p><input id="query" type="search" autofocus
+            placeholder="Package name"></p>
+        <ul id="results"></ul>
+{}""".format(self.get_html_header(), self.get_html_footer(
+            "<script src=\"sources/search.js\"></script>\n"
+            "<script src=\"{}/{}\"></script>".format(
+                SEARCH_DIRECTORY, SEARCH_TAGS)))
+
+    def write_search_index(self, path, error_dictionary, package_dictionary,
+                           packages=None):
+        """Writes search page and shards of search index of packages. Only
+        changed shards are rewritten and shards of removed packages are
+        deleted.
+
+        Args:
+            path(str): path of web application.
+            error_dictionary(dict): dictionary from `get_error_dictionary`.
+                Only its keys are used, so statistics from
+                `ErrorIndex.get_summary` can be provided too.
+            package_dictionary(dict): dictionary from
+                `get_package_dictionary`.
+            packages(iterable): names of changed packages. If they are
+                provided, only shards with their prefixes are updated and
+                the other packages are kept from shards written before.
+        """
+        directory = os.path.join(path, SEARCH_DIRECTORY)
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        if packages is not None:
+            packages = set(packages)
+            package_dictionary = dict(
+                (x, package_dictionary[x]) for x in packages
+                if x in package_dictionary)
+        tags, shards = get_search_index(
+            error_dictionary, package_dictionary, self.get_error_page)
+        files = {SEARCH_TAGS: "{}{});\n".format(
+            SEARCH_TAGS_PREFIX, json.dumps(tags, separators=(",", ":")))}
+        if packages is None:
+            removed = os.listdir(directory)
+        else:
+            shards, removed = self._update_search_shards(
+                directory, tags, shards, packages)
+        for name, shard in shards.items():
+            files[name + ".js"] = "{}{});\n".format(
+                get_search_shard_prefix(name), json.dumps(
+                    shard, separators=(",", ":"), sort_keys=True))
+        for name in removed:
+            if name not in files:
+                os.remove(os.path.join(directory, name))
+        for name, content in files.items():
+            file_path = os.path.join(directory, name)
+            if os.path.exists(file_path):
+                with io.open(file_path, encoding="utf-8") as file_o:
+                    if file_o.read() == content:
+                        continue
+            with io.open(file_path, "w", encoding="utf-8") as file_o:
+                file_o.write(content)
+            timing.count("files_written")
+        with open(os.path.join(path, "search.html"), "w+") as file_o:
+            file_o.write(self.generate_search_page())
+
+    def _update_search_shards(self, directory, tags, shards, packages):
+        """Merge shards of changed packages with shards written before.
+        Positions of errors in old shards are remapped and so all shards
+        are updated when list of errors changed.
+
+        Returns:
+            tuple: dictionary with updated shards and list of names of
+                files of shards that became empty.
+        """
+        old_tags = read_search_file(
+            os.path.join(directory, SEARCH_TAGS), SEARCH_TAGS_PREFIX) or []
+        names = set(get_search_shard_name(x) for x in packages)
+        positions = None
+        if old_tags != tags:
+            new_positions = dict(
+                ((x[0], x[1]), position) for position, x in enumerate(tags))
+            positions = [new_positions.get((x[0], x[1])) for x in old_tags]
+            names.update(
+                x[:-3] for x in os.listdir(directory)
+                if x.endswith(".js") and x != SEARCH_TAGS)
+        updated = {}
+        removed = []
+        for name in names:
+            shard = read_search_file(
+                os.path.join(directory, name + ".js"),
+                get_search_shard_prefix(name)) or {}
+            for package in packages.intersection(shard):
+                del shard[package]
+            if positions is not None:
+                for package, errors in shard.items():
+                    shard[package] = sorted(
+                        positions[x] for x in errors
+                        if x < len(positions) and positions[x] is not None)
+            shard.update(shards.get(name, {}))
+            if shard:
+                updated[name] = shard
+            else:
+                removed.append(name + ".js")
+        return updated, removed
+
+    def get_error_page(self, error_type, error, page=1):
+        """Get relative path of detail page of error.
+
+        Args:
+            error_type(str): severity of error.
+            error(str): name of error.
+            page(int): number of page if details are split into pages.
+        """
+        return os.path.join(
+            error_type.lower(), get_error_page_name(error, page))
+
+    def get_package_page(self, package):
+        """Get relative path of detail page of package.
+
+        Args:
+            package(str): name of package.
+        """
+        return os.path.join("packages", "{}.html".format(package))
+
+    def _get_pages(self, error_dictionary, package_dictionary, errors=None,
+                   packages=None, page_size=None):
+        """Get list of tupples with relative path of detail page, function
+        that renders it and arguments of the function. Only pages of
+        provided errors and packages are returned if any of them is
+        provided. Details of errors are split into pages with at most
+        page_size packages."""
+        if errors is None and packages is None:
+            errors = [
+                (x, y) for x in error_dictionary for y in error_dictionary[x]]
+            packages = package_dictionary.keys()
+        pages = []
+        for error_type, error in errors or ():
+            if error in error_dictionary.get(error_type, {}):
+                error_pages = split_error_info(
+                    error_dictionary[error_type][error], page_size)
+                for page, error_info in enumerate(error_pages, 1):
+                    pages.append((
+                        self.get_error_page(error_type, error, page),
+                        "generate_detail",
+                        (error_info, error_type, error, page,
+                         len(error_pages))))
+        for package in packages or ():
+            if package in package_dictionary:
+                pages.append((
+                    self.get_package_page(package),
+                    "generate_package_detail",
+                    (package, package_dictionary[package])))
+        return pages
+
+    @timing.timed("details")
+    def generate_details(self, error_dictionary, path,
+                         package_dictionary=None, workers=None,
+                         incremental=False, errors=None, packages=None,
+                         summary=None, page_size=None, package_list=None):
+        """Generate html page for each error in error_dictionary and for each
+        package on given path.
+
+        Pages are rendered in a pool of processes. Hash of data of every
+        page is saved in manifest and pages of previous run which are not
+        generated anymore are removed. In incremental mode the hash is
+        compared with manifest saved by previous run and only pages with
+        changed data are written. If errors or
+        packages are provided, only their pages and shards of search index
+        with their prefixes are generated and pages of the other errors and
+        packages are kept from previous run. Dictionaries then need to
+        contain only the provided errors and packages, lists of all errors
+        and packages are written from summary and package_list.
+
+        Args:
+            error_dictionary(dict): dictionary object with information
+                about errors and warnings.
+            package_dictionary(dict): dictionary object with information
+                about errors and warnings of packages. It is created from
+                error_dictionary if it is not provided.
+            workers(int): Maximal number of processes. Defaults to number of
+                processors, pages are rendered in this process if it is 1.
+            incremental(bool): Write only pages whose data changed.
+            errors(iterable): tupples with severity and name of errors whose
+                pages are generated.
+            packages(iterable): names of packages whose pages are generated.
+            summary(dict): statistics of errors from
+                `ErrorIndex.get_summary`.
+            page_size(int): Maximal number of packages on one page of error
+                details. Details are not split if it is not provided.
+            package_list(list): tupples with name, source package and number
+                of errors of all packages from `ErrorIndex.get_package_list`
+                used for list of packages.
+
+        Returns:
+            list: Relative paths of written detail pages.
+        """
+        if not os.path.exists(path):
+            raise OSError(2, 'No such file or directory', path)
+
+        self.copy_sources(path)
+
+        partial = errors is not None or packages is not None
+        if partial:
+            errors = list(errors or ())
+            packages = list(packages or ())
+        all_errors = summary["errors"] if summary else error_dictionary
+        with open(os.path.join(path, "index.html"), "w+") as file_o:
+            file_o.write(self.get_html_header())
+            file_o.write(
+                "<h1><a href='packages/index.html'>Packages</a> | "
+                "<a href='search.html'>Search</a></h1>")
+            self.write_error_list(file_o, all_errors, summary)
+            file_o.write(self.get_html_footer())
+
+        if package_dictionary is None:
+            package_dictionary = get_package_dictionary(error_dictionary)
+        directories = ["packages"] + [x.lower() for x in error_dictionary]
+        for directory in directories:
+            directory = os.path.join(path, directory)
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+        with open(os.path.join(path, "packages", "index.html"), "w+")\
+                as file_o:
+            file_o.write(self.get_html_header("../"))
+            self.write_package_list(
+                file_o, package_dictionary, package_list)
+            file_o.write(self.get_html_footer())
+        self.write_search_index(
+            path, all_errors, package_dictionary,
+            packages if partial else None)
+
+        manifest_path = os.path.join(path, MANIFEST)
+        old_manifest = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as manifest_file:
+                old_manifest = json.load(manifest_file)
+        manifest = dict(old_manifest) if partial else {}
+        pages = self._get_pages(
+            error_dictionary, package_dictionary, errors, packages,
+            page_size)
+        jobs = []
+        for page, method, args in pages:
+            manifest[page] = hashlib.sha256(json.dumps(
+                [__version__, method, args],
+                sort_keys=True).encode("utf-8")).hexdigest()
+            if not incremental or old_manifest.get(page) != manifest[page]\
+                    or not os.path.exists(os.path.join(path, page)):
+                jobs.append((
+                    type(self), method, args, os.path.join(path, page)))
+
+        if workers == 1 or len(jobs) < 2:
+            for job in jobs:
+                _write_page(job)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(
+                    _write_page, jobs,
+                    chunksize=max(len(jobs) // (4 * (workers or 4)), 1)))
+
+        if partial:
+            removed = set(
+                [self.get_error_page(*x) for x in errors] +
+                [self.get_package_page(x) for x in packages])
+            for error_type, error in errors:
+                prefix = self.get_error_page(error_type, error)[:-5] + "-page"
+                removed.update(
+                    x for x in old_manifest if x.startswith(prefix) and
+                    x[len(prefix):-5].isdigit() and x.endswith(".html"))
+            removed.difference_update(x[0] for x in pages)
+        else:
+            removed = set(old_manifest) - set(manifest)
+        for page in removed:
+            manifest.pop(page, None)
+            if os.path.exists(os.path.join(path, page)):
+                os.remove(os.path.join(path, page))
+        with open(manifest_path, "w+") as manifest_file:
+            json.dump(manifest, manifest_file, sort_keys=True)
+        # Pages of web application, both index pages, search and manifest.
+        timing.count("files_written", len(jobs) + 4)
+        return [os.path.relpath(x[3], path) for x in jobs]
+
+
+def _write_page(job):
+    """Render one page of web application and write it into file.
+
+    Args:
+        job(tuple): class of html generator, name of its method rendering
+            the page, arguments of the method and path of the page.
+    """
+    generator_class, method, args, page_path = job
+    content = getattr(generator_class({}), method)(*args)
+    with open(page_path, "w+") as file_o:
+        file_o.write(content)
@@ -0,0 +1,633 @@
+# -*- coding: utf-8 -*-
+
+"""Compact reverse index of rpmlint errors."""
+
+import heapq
+import pickle
+from array import array
+from rpmlint_list.priority import get_priority, has_package_rules
+
+SEVERITIES = {"E": "Error", "W": "Warning"}
+
+TOP_PACKAGES = 100
+# Source stored for errors without source in records where other errors
+# have it, it is never returned.
+NO_SOURCE = ""
+# Version of layout of pickled index, it has to be increased whenever
+# attributes of `ErrorIndex` or `ErrorRecord` change.
+INDEX_FORMAT = 2
+# Errors raised by unpickling of file which is not index of this format.
+LOAD_ERRORS = (
+    AttributeError, EOFError, ImportError, IndexError, TypeError,
+    ValueError, pickle.UnpicklingError)
+
+ARCHITECTURES = (
+    "noarch", "src", "x86_64", "i386", "i586", "i686", "aarch64", "armv7hl",
+    "ppc64", "ppc64le", "s390x", "riscv64")
+
+SUBPACKAGE_SUFFIXES = (
+    "-devel", "-libs", "-lib", "-doc", "-docs", "-common", "-static",
+    "-debuginfo", "-debugsource", "-tests", "-data", "-utils", "-tools",
+    "-headers", "-javadoc", "-examples", "-langpack")
+
+
+def get_severity_name(severity):
+    """Get human readable name of severity used by rpmlint.
+
+    Args:
+        severity(str): severity letter from rpmlint output.
+    """
+    return SEVERITIES.get(severity, severity)
+
+
+def get_source_package_name(package):
+    """Guess name of source package from name of binary package reported by
+    rpmlint by stripping architecture and common subpackage suffixes.
+
+    Args:
+        package(str): name of package, e.g. `foo-devel.x86_64`.
+    """
+    name, _, architecture = package.rpartition(".")
+    if name and architecture in ARCHITECTURES:
+        package = name
+    stripped = True
+    while stripped:
+        stripped = False
+        for suffix in SUBPACKAGE_SUFFIXES:
+            if package.endswith(suffix) and len(package) > len(suffix):
+                package = package[:-len(suffix)]
+                stripped = True
+    return package
+
+
+class StringTable(object):
+    """Store every string only once and refer to it by integer ID."""
+
+    __slots__ = ("strings", "ids")
+
+    def __init__(self):
+        self.strings = []
+        self.ids = {}
+
+    def __len__(self):
+        return len(self.strings)
+
+    def __getitem__(self, string_id):
+        return self.strings[string_id]
+
+    def intern(self, value):
+        """Get ID of string, string is added to the table if it is new.
+
+        Args:
+            value(str): string that is interned.
+        """
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+
+class ErrorRecord(object):
+    """Occurrences of one error.
+
+    Every occurrence is stored as ID of package and ID of detail on the same
+    position of two arrays and, if errors contain their source, ID of source
+    in the third array. Errors without source have `NO_SOURCE` there.
+    Numbers of distinct packages and details are None when occurrences
+    changed since they were counted. Priorities of packages which differ
+    from priority of error because of rules limited to packages are stored
+    in dictionary by package ID.
+    """
+
+    __slots__ = (
+        "priority", "packages", "details", "sources", "package_count",
+        "detail_count", "package_priorities")
+
+    def __init__(self, priority=None):
+        self.priority = priority
+        self.packages = array("i")
+        self.details = array("i")
+        self.sources = None
+        self.package_priorities = None
+        self.package_count = None
+        self.detail_count = None
+
+    def __len__(self):
+        return len(self.packages)
+
+    def count(self):
+        """Count distinct packages and details if they changed."""
+        if self.package_count is None:
+            self.package_count = len(set(self.packages))
+            self.detail_count = len(set(self.details))
+
+    def get_statistics(self):
+        """Get dictionary with number of distinct packages, number of
+        occurrences, number of distinct details and priority of error."""
+        self.count()
+        return {
+            "packages": self.package_count,
+            "occurrences": len(self.packages),
+            "details": self.detail_count,
+            "priority": self.priority}
+
+
+class ErrorIndex(object):
+    """Reverse index from errors to packages where they were reported.
+
+    Package names, error names and details are interned in a string table
+    and lists of packages are stored in arrays of IDs, so the index uses
+    only a fraction of memory needed by dictionary from
+    `get_error_dictionary`.
+
+    Errors are indexed also by package. For every package there is an array
+    with IDs of severity, error name and detail of all its errors and every
+    package is assigned to its source package.
+
+    Args:
+        priority_info(dict): Dictionary with containing error name as a key
+            and its priority as value.
+    """
+
+    def __init__(self, priority_info=None):
+        self.priority_info = priority_info
+        self.strings = StringTable()
+        self.errors = {}
+        self.packages = {}
+        self.source_packages = {}
+        self.testcases = {}
+        self.top_packages = None
+
+    def set_priority_info(self, priority_info):
+        """Replace priorities and recompute priorities of all errors and
+        priorities of errors in packages set by rules limited to packages.
+
+        Args:
+            priority_info(dict): Dictionary with containing error name as a
+                key and its priority as value.
+        """
+        self.priority_info = priority_info
+        package_rules = has_package_rules(priority_info)
+        for errors in self.errors.values():
+            for error_id, record in errors.items():
+                error = self.strings[error_id]
+                record.priority = get_priority(priority_info, error)
+                record.package_priorities = None
+                if not package_rules:
+                    continue
+                for package_id in set(record.packages):
+                    priority = get_priority(
+                        priority_info, error, self.strings[package_id])
+                    if priority != record.priority:
+                        if record.package_priorities is None:
+                            record.package_priorities = {}
+                        record.package_priorities[package_id] = priority
+
+    def add(self, error):
+        """Add error to index.
+
+        Args:
+            error(tuple): package, severity, error name, detail and
+                optionally source of the error.
+        """
+        intern = self.strings.intern
+        errors = self.errors.get(get_severity_name(error[1]))
+        if errors is None:
+            errors = self.errors[get_severity_name(error[1])] = {}
+        error_id = intern(error[2])
+        record = errors.get(error_id)
+        if record is None:
+            record = errors[error_id] = ErrorRecord(
+                get_priority(self.priority_info, error[2]))
+        package_id = intern(error[0])
+        detail_id = intern(error[3])
+        if has_package_rules(self.priority_info):
+            priority = get_priority(self.priority_info, error[2], error[0])
+            if priority != record.priority:
+                if record.package_priorities is None:
+                    record.package_priorities = {}
+                record.package_priorities[package_id] = priority
+        record.packages.append(package_id)
+        record.details.append(detail_id)
+        record.package_count = None
+        self.top_packages = None
+        package_errors = self.packages.get(package_id)
+        if package_errors is None:
+            package_errors = self.packages[package_id] = array("i")
+            self.source_packages.setdefault(
+                intern(get_source_package_name(error[0])),
+                array("i")).append(package_id)
+        package_errors.extend(
+            (intern(get_severity_name(error[1])), error_id, detail_id))
+        if len(error) > 4:
+            if record.sources is None:
+                record.sources = array(
+                    "i", [intern(NO_SOURCE)]) * (len(record.packages) - 1)
+            record.sources.append(intern(error[4]))
+        elif record.sources is not None:
+            record.sources.append(intern(NO_SOURCE))
+
+    def remove_packages(self, packages):
+        """Remove all errors of packages from index.
+
+        Args:
+            packages(iterable): names of packages.
+
+        Returns:
+            set: Tupples with severity and name of errors that were changed.
+        """
+        strings = self.strings
+        package_ids = set(
+            strings.ids[x] for x in packages
+            if strings.ids.get(x) in self.packages)
+        records = set()
+        for package_id in package_ids:
+            package_errors = self.packages.pop(package_id)
+            for position in range(0, len(package_errors), 3):
+                records.add((
+                    strings[package_errors[position]],
+                    package_errors[position + 1]))
+            source_id = strings.ids[
+                get_source_package_name(strings[package_id])]
+            binary_packages = array("i", (
+                x for x in self.source_packages[source_id]
+                if x != package_id))
+            if binary_packages:
+                self.source_packages[source_id] = binary_packages
+            else:
+                del self.source_packages[source_id]
+        for severity, error_id in records:
+            record = self.errors[severity][error_id]
+            kept = [
+                position for position, package in enumerate(record.packages)
+                if package not in package_ids]
+            if not kept:
+                del self.errors[severity][error_id]
+                if not self.errors[severity]:
+                    del self.errors[severity]
+                continue
+            record.packages = array("i", (record.packages[x] for x in kept))
+            record.details = array("i", (record.details[x] for x in kept))
+            record.package_count = None
+            if record.sources is not None:
+                record.sources = array(
+                    "i", (record.sources[x] for x in kept))
+            if record.package_priorities is not None:
+                record.package_priorities = dict(
+                    (x, y) for x, y in record.package_priorities.items()
+                    if x not in package_ids) or None
+        self.top_packages = None
+        return set((x, strings[y]) for x, y in records)
+
+    def replace_packages(self, error_list, testcases=None):
+        """Replace all errors of packages present in error list by errors
+        from the list, e.g. by errors from report of a single build.
+
+        Args:
+            error_list(iterable): List or generator of error tupples.
+            testcases(dict): checked source packages and their packages
+                from `parse_report`. Errors of all packages recorded for
+                them by `add_testcases` are replaced too, so packages
+                without errors in the list are cleared.
+
+        Returns:
+            tuple: set of tupples with severity and name of changed errors
+                and set of names of changed packages.
+        """
+        error_list = list(error_list)
+        packages = set(x[0] for x in error_list)
+        for name in testcases or ():
+            packages.update(self.strings[x] for x in self.testcases.pop(
+                self.strings.ids.get(name), ()))
+        changed_errors = self.remove_packages(packages)
+        self.update(error_list)
+        if testcases:
+            self.add_testcases(testcases)
+        changed_errors.update(
+            (get_severity_name(x[1]), x[2]) for x in error_list)
+        return changed_errors, packages
+
+    def add_testcases(self, testcases):
+        """Record packages reported in testcases of report, i.e. packages
+        built from checked source packages.
+
+        Args:
+            testcases(dict): name of testcase as key and names of packages
+                reported in it as value, see `parse_report`.
+        """
+        intern = self.strings.intern
+        for name, packages in testcases.items():
+            testcase_id = intern(name)
+            package_ids = set(self.testcases.get(testcase_id, ()))
+            package_ids.update(intern(x) for x in packages)
+            self.testcases[testcase_id] = array("i", sorted(package_ids))
+
+    def get_testcases(self):
+        """Get dictionary where key is name of testcase and value is list of
+        packages recorded for it by `add_testcases`."""
+        return dict(
+            (self.strings[x], [self.strings[y] for y in packages])
+            for x, packages in self.testcases.items())
+
+    def save(self, path):
+        """Save index into file together with version of its format.
+
+        Args:
+            path(str): path to file.
+        """
+        with open(path, "wb") as index_file:
+            pickle.dump(
+                (INDEX_FORMAT, self), index_file, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        """Load index saved by `save`. ValueError is raised if the file is
+        not index or it was saved in other format.
+
+        Args:
+            path(str): path to file.
+        """
+        with open(path, "rb") as index_file:
+            try:
+                index_format, error_index = pickle.load(index_file)
+            except LOAD_ERRORS:
+                index_format = error_index = None
+        if index_format != INDEX_FORMAT or not isinstance(error_index, cls):
+            raise ValueError(
+                "Index has incompatible format, create it again: {}".format(
+                    path))
+        return error_index
+
+    def update(self, error_list):
+        """Add all errors from error list to index.
+
+        Args:
+            error_list(iterable): List or generator of error tupples.
+        """
+        for error in error_list:
+            self.add(error)
+        self.count()
+        return self
+
+    def count(self):
+        """Count statistics of changed errors and find packages with the
+        most errors. It is done by `update`, statistics of errors added by
+        `add` are counted when they are requested."""
+        for errors in self.errors.values():
+            for record in errors.values():
+                record.count()
+        if self.top_packages is None:
+            self.top_packages = heapq.nlargest(
+                TOP_PACKAGES, self.packages,
+                key=lambda x: len(self.packages[x]))
+
+    def iter_errors(self):
+        """Yield error tupples stored in index. Severity is provided by its
+        name."""
+        strings = self.strings
+        for severity, errors in self.errors.items():
+            for error_id, record in errors.items():
+                for position in range(len(record)):
+                    error = (
+                        strings[record.packages[position]],
+                        severity,
+                        strings[error_id],
+                        strings[record.details[position]])
+                    if record.sources is not None and\
+                            strings[record.sources[position]] != NO_SOURCE:
+                        error += (strings[record.sources[position]],)
+                    yield error
+
+    def _get_record(self, severity, error):
+        error_id = self.strings.ids.get(error)
+        if error_id is None or error_id not in self.errors.get(severity, {}):
+            raise KeyError(error)
+        return self.errors[severity][error_id]
+
+    def get_severities(self):
+        """Get list of severities present in index."""
+        return list(self.errors)
+
+    def get_errors(self, severity):
+        """Get list of error names with given severity.
+
+        Args:
+            severity(str): name of severity, e.g. `Error` or `Warning`.
+        """
+        return [self.strings[x] for x in self.errors.get(severity, {})]
+
+    def get_priority(self, severity, error, package=None):
+        """Get priority of error, of error in package if it is provided.
+
+        Args:
+            severity(str): name of severity.
+            error(str): name of error.
+            package(str): name of package.
+        """
+        record = self._get_record(severity, error)
+        if package is not None and record.package_priorities:
+            package_id = self.strings.ids.get(package)
+            return record.package_priorities.get(package_id, record.priority)
+        return record.priority
+
+    def get_package_priorities(self, severity, error):
+        """Get dictionary of packages and their priorities which differ
+        from priority of error or None if there are no such packages.
+
+        Args:
+            severity(str): name of severity.
+            error(str): name of error.
+        """
+        record = self._get_record(severity, error)
+        if not record.package_priorities:
+            return None
+        return dict(
+            (self.strings[x], y) for x, y in record.package_priorities.items())
+
+    def get_details(self, severity, error):
+        """Get dictionary where key is error detail and value is list of
+        packages where error with this detail was reported.
+
+        Args:
+            severity(str): name of severity.
+            error(str): name of error.
+        """
+        strings = self.strings
+        record = self._get_record(severity, error)
+        details = {}
+        for package, detail in zip(record.packages, record.details):
+            details.setdefault(strings[detail], []).append(strings[package])
+        return details
+
+    def get_sources(self, severity, error):
+        """Get dictionary where key is package and value is list of sources
+        where error was reported for it or None if errors had no source.
+
+        Args:
+            severity(str): name of severity.
+            error(str): name of error.
+        """
+        record = self._get_record(severity, error)
+        if record.sources is None:
+            return None
+        strings = self.strings
+        sources = {}
+        for package, source in zip(record.packages, record.sources):
+            if strings[source] == NO_SOURCE:
+                continue
+            package_sources = sources.setdefault(strings[package], [])
+            if strings[source] not in package_sources:
+                package_sources.append(strings[source])
+        return sources
+
+    def get_statistics(self, severity, error):
+        """Get dictionary with number of distinct packages, number of
+        occurrences, number of distinct details and priority of error.
+
+        Args:
+            severity(str): name of severity.
+            error(str): name of error.
+        """
+        return self._get_record(severity, error).get_statistics()
+
+    def get_top_packages(self, count=10):
+        """Get list of tupples with name of package and number of its errors
+        for packages with the most errors.
+
+        Args:
+            count(int): maximal number of packages.
+        """
+        if self.top_packages is None or count > TOP_PACKAGES:
+            top = heapq.nlargest(
+                count, self.packages, key=lambda x: len(self.packages[x]))
+        else:
+            top = self.top_packages[:count]
+        return [(self.strings[x], len(self.packages[x]) // 3) for x in top]
+
+    def get_summary(self, top=10):
+        """Get statistics of all errors, total numbers for each severity and
+        packages with the most errors.
+
+        Args:
+            top(int): number of packages with the most errors.
+        """
+        summary = {"severities": {}, "errors": {}}
+        for severity, errors in self.errors.items():
+            summary["errors"][severity] = {}
+            totals = summary["severities"][severity] = {
+                "errors": len(errors), "occurrences": 0}
+            for error_id, record in errors.items():
+                summary["errors"][severity][self.strings[error_id]] =\
+                    record.get_statistics()
+                totals["occurrences"] += len(record)
+        summary["top_packages"] = self.get_top_packages(top)
+        return summary
+
+    def get_packages(self):
+        """Get list of packages present in index."""
+        return [self.strings[x] for x in self.packages]
+
+    def get_package_errors(self, package):
+        """Get list of tupples with severity, error name and detail of all
+        errors reported for package.
+
+        Args:
+            package(str): name of package.
+        """
+        package_id = self.strings.ids.get(package)
+        if package_id not in self.packages:
+            raise KeyError(package)
+        strings = self.strings
+        package_errors = self.packages[package_id]
+        return [
+            tuple(strings[x] for x in package_errors[position:position + 3])
+            for position in range(0, len(package_errors), 3)]
+
+    def get_source_packages(self):
+        """Get list of source packages present in index."""
+        return [self.strings[x] for x in self.source_packages]
+
+    def get_source_package(self, package):
+        """Get name of source package of package.
+
+        Args:
+            package(str): name of package.
+        """
+        if package not in self.strings.ids or\
+                self.strings.ids[package] not in self.packages:
+            raise KeyError(package)
+        return get_source_package_name(package)
+
+    def get_binary_packages(self, source_package):
+        """Get list of packages built from source package.
+
+        Args:
+            source_package(str): name of source package.
+        """
+        source_id = self.strings.ids.get(source_package)
+        if source_id not in self.source_packages:
+            raise KeyError(source_package)
+        return [self.strings[x] for x in self.source_packages[source_id]]
+
+    def get_package_list(self):
+        """Get sorted list of tupples with name of package, name of its
+        source package and number of its errors."""
+        return sorted(
+            (self.strings[x], get_source_package_name(self.strings[x]),
+             len(package_errors) // 3)
+            for x, package_errors in self.packages.items())
+
+    def to_package_dict(self, packages=None):
+        """Get dictionary where key is package and value contains name of its
+        source package and its errors by severity and error name.
+
+        Args:
+            packages(iterable): names of included packages, unknown ones
+                are skipped. All packages are included if it is not
+                provided.
+        """
+        if packages is None:
+            packages = self.get_packages()
+        else:
+            packages = [
+                x for x in packages
+                if self.strings.ids.get(x) in self.packages]
+        package_dictionary = {}
+        for package in packages:
+            errors = {}
+            for severity, error, detail in self.get_package_errors(package):
+                errors.setdefault(severity, {}).setdefault(
+                    error, []).append(detail)
+            package_dictionary[package] = {
+                "source_package": get_source_package_name(package),
+                "errors": errors}
+        return package_dictionary
+
+    def to_dict(self, errors=None):
+        """Get index in the same format as `get_error_dictionary`.
+
+        Args:
+            errors(iterable): tupples with severity and name of included
+                errors, unknown ones are skipped. All errors are included
+                if it is not provided.
+        """
+        if errors is None:
+            errors = [
+                (x, self.strings[y])
+                for x in self.errors for y in self.errors[x]]
+        error_dictionary = {}
+        for severity, error in errors:
+            if self.strings.ids.get(error) not in self.errors.get(
+                    severity, ()):
+                continue
+            error_info = error_dictionary.setdefault(severity, {})[error] = {
+                "detail": self.get_details(severity, error),
+                "priority": self.get_priority(severity, error)}
+            sources = self.get_sources(severity, error)
+            if sources is not None:
+                error_info["sources"] = sources
+            priorities = self.get_package_priorities(severity, error)
+            if priorities is not None:
+                error_info["package_priorities"] = priorities
+        return error_dictionary
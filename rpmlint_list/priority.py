@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+
+"""Priorities of rpmlint errors."""
+
+import re
+
+REGEX_PREFIX = "re:"
+
+
+def get_priority(priority_info, error, package=None):
+    """Get priority of error. It is None if there is no priority
+    information and 0 if error has no priority.
+
+    Args:
+        priority_info: PriorityRules or dictionary with error name as a key
+            and its priority as value.
+        error(str): name of error.
+        package(str): name of package where error was reported.
+    """
+    if not priority_info:
+        return None
+    if isinstance(priority_info, PriorityRules):
+        priority = priority_info.get_priority(error, package)
+    else:
+        priority = priority_info.get(error)
+    return 0 if priority is None else priority
+
+
+def has_package_rules(priority_info):
+    """Check if priority of error can depend on package where it was
+    reported.
+
+    Args:
+        priority_info: PriorityRules or dictionary with error name as a key
+            and its priority as value.
+    """
+    return bool(getattr(priority_info, "package_rules", False))
+
+
+def _translate_glob(pattern):
+    """Translate glob pattern with `*`, `?` and `[...]` into regular
+    expression."""
+    parts = []
+    for token in re.split(r"(\*|\?|\[[^\]]+\])", pattern):
+        if token == "*":
+            parts.append(".*")
+        elif token == "?":
+            parts.append(".")
+        elif token.startswith("[") and token.endswith("]"):
+            token = token[1:-1].replace("\\", "\\\\")
+            if token.startswith("!"):
+                token = "^" + token[1:]
+            parts.append("[{}]".format(token))
+        else:
+            parts.append(re.escape(token))
+    return "".join(parts)
+
+
+def _compile_pattern(pattern):
+    """Get regular expression for error pattern which is exact name, glob
+    pattern or regular expression with `re:` prefix."""
+    if pattern.startswith(REGEX_PREFIX):
+        return pattern[len(REGEX_PREFIX):]
+    return _translate_glob(pattern)
+
+
+class PriorityRules(object):
+    """Priorities of errors from configuration.
+
+    Every rule is a line `[PACKAGE/]PATTERN PRIORITY` where pattern is name
+    of error, glob pattern like `*-without-*` or regular expression with
+    `re:` prefix and optional package is glob pattern of package names the
+    rule is limited to. Rules limited to packages take precedence, then
+    exact names and then the first matching pattern.
+
+    All patterns are compiled into one regular expression and priorities of
+    errors are memoized, so lookup is a dictionary access in most cases.
+    Rules limited to packages matching every package are memoized too, so
+    only these few rules are matched with errors of the package.
+
+    Args:
+        rules(iterable): tupples with key and priority of rules.
+    """
+
+    def __init__(self, rules=()):
+        self.rules = list(rules)
+        self.exact = {}
+        patterns = []
+        scoped = []
+        for position, (key, priority) in enumerate(self.rules):
+            package = None
+            if not key.startswith(REGEX_PREFIX) and "/" in key:
+                package, key = key.split("/", 1)
+            if package is not None:
+                scoped.append((
+                    re.compile("(?:{})\\Z".format(_compile_pattern(package))),
+                    re.compile("(?:{})\\Z".format(_compile_pattern(key))),
+                    priority))
+            elif key.startswith(REGEX_PREFIX) or\
+                    any(x in key for x in "*?["):
+                patterns.append((position, _compile_pattern(key)))
+            else:
+                self.exact.setdefault(key, priority)
+        self.matcher = self._combine(patterns)
+        self.scoped = scoped
+        self.package_rules = len(scoped)
+        self.cache = {}
+        self.package_cache = {}
+        self.rule_sets = {}
+
+    def _combine(self, patterns):
+        """Compile patterns into one regular expression where every pattern
+        is a named group containing its position in rules."""
+        patterns = list(patterns)
+        if not patterns:
+            return None
+        return re.compile("(?:{})\\Z".format("|".join(
+            "(?P<rule{}>{})".format(x, y) for x, y in patterns)))
+
+    def _match(self, matcher, value):
+        match = matcher.match(value)
+        if match is None:
+            return None
+        return self.rules[int(match.lastgroup[4:])][1]
+
+    def _get_package_rules(self, package):
+        """Get memoized tupple with error patterns and priorities of rules
+        limited to packages which match package. Packages matching the
+        same rules share the tupple."""
+        rules = self.package_cache.get(package)
+        if rules is None:
+            rules = tuple(
+                (x[1], x[2]) for x in self.scoped if x[0].match(package))
+            rules = self.package_cache[package] =\
+                self.rule_sets.setdefault(rules, rules)
+        return rules
+
+    def __len__(self):
+        return len(self.rules)
+
+    def __repr__(self):
+        return "PriorityRules({!r})".format(self.rules)
+
+    def __contains__(self, error):
+        return self.get_priority(error) is not None
+
+    def __getitem__(self, error):
+        priority = self.get_priority(error)
+        if priority is None:
+            raise KeyError(error)
+        return priority
+
+    def get(self, error, default=None):
+        """Get priority of error or default if no rule matches.
+
+        Args:
+            error(str): name of error.
+            default: value returned if no rule matches.
+        """
+        priority = self.get_priority(error)
+        return default if priority is None else priority
+
+    def get_priority(self, error, package=None):
+        """Get priority of error or None if no rule matches.
+
+        Args:
+            error(str): name of error.
+            package(str): name of package where error was reported.
+        """
+        if package is not None and self.scoped:
+            for error_pattern, priority in self._get_package_rules(package):
+                if error_pattern.match(error):
+                    return priority
+        if error in self.exact:
+            return self.exact[error]
+        if error not in self.cache:
+            self.cache[error] = None if self.matcher is None else\
+                self._match(self.matcher, error)
+        return self.cache[error]
+
+    def __getstate__(self):
+        return self.rules
+
+    def __setstate__(self, state):
+        self.__init__(state)
+
+    @classmethod
+    def load(cls, path):
+        """Load rules from configuration file. Empty lines and lines
+        starting with `#` are ignored.
+
+        Args:
+            path(str): Path to configuration file.
+        """
+        with open(path) as priority_file:
+            content = priority_file.readlines()
+        return cls(
+            x.strip().split(None, 1) for x in content
+            if x.strip() and not x.strip().startswith("#"))
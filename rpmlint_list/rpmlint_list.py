@@ -1,7 +1,323 @@
-import re
+import contextlib
+import glob
+import gzip
+import hashlib
+import json
+import mmap
 import os
-import requests
-import xml.etree.ElementTree as ET
+import sys
+from urllib.parse import urlparse
+from rpmlint_list.index import (
+    ErrorIndex, get_severity_name, get_source_package_name)
+from rpmlint_list.priority import (
+    PriorityRules, get_priority, has_package_rules)
+from rpmlint_list import timing
+
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# requests, ElementTree and process pools are imported only by functions
+# which use them, so the command line starts fast when they are not needed.
+
+_session = None
+
+# Seconds to wait for connection and for every chunk of response.
+DEFAULT_TIMEOUT = 60
+DEFAULT_RETRIES = 3
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+_fetch_options = {"timeout": DEFAULT_TIMEOUT, "retries": DEFAULT_RETRIES}
+
+MANIFEST = ".manifest.json"
+
+STATIC_DIRECTORY = os.path.join(os.path.dirname(__file__), "static")
+
+SOURCES = ("search.js", "sorttable.js", "style.css")
+SEARCH_DIRECTORY = "search"
+SEARCH_PREFIX_LENGTH = 2
+SEARCH_CHARACTERS = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+
+def _normalize_field(value):
+    """Replace empty values and dash placeholders with single dash."""
+    if not value.strip("-"):
+        return "-"
+    return value
+
+
+def parse_error_line(line):
+    """Parse one line of rpmlint output.
+
+    Both ``pkg: E: tag detail`` and ``pkg.arch: W: tag`` forms are
+    understood. Empty fields and fields made only of dashes are replaced
+    by ``-``.
+
+    Args:
+        line(str): line printed by rpmlint.
+
+    Returns:
+        tuple: package, severity, error name and detail or None if line
+            doesn't contain rpmlint error.
+    """
+    position = line.find(": ")
+    while position != -1:
+        if line[position + 3:position + 5] == ": " and\
+                not line[position + 2].isspace():
+            tag, _, detail = line[position + 5:].strip().partition(" ")
+            if tag:
+                return (
+                    _normalize_field(line[:position]),
+                    line[position + 2],
+                    tag,
+                    _normalize_field(detail.strip()))
+        position = line.find(": ", position + 1)
+    return None
+
+
+def parse_report(report, testcases=None):
+    """Yield tupples where first item is package where error happened
+    and remaining items are error severity, name and detail.
+
+    The report is parsed incrementally and every ``testcase`` element is
+    dropped as soon as its failure was processed, so memory usage does not
+    grow with the size of the report.
+
+    Args:
+        report: file-like object with xml report from rpmlint.
+        testcases(dict): names of all ``testcase`` elements, i.e. of
+            checked source packages including those without errors, are
+            added to it as keys with sets of names of packages reported in
+            them as values if it is provided.
+    """
+    import xml.etree.ElementTree as ET
+
+    parents = []
+    findings = 0
+    try:
+        for event, element in ET.iterparse(report, events=("start", "end")):
+            if event == "start":
+                parents.append(element)
+                continue
+            parents.pop()
+            if element.tag != "testcase":
+                continue
+            packages = None
+            if testcases is not None and element.get("name"):
+                packages = testcases.setdefault(element.get("name"), set())
+            failure = element.find("failure")
+            if failure is not None and failure.text:
+                for line in failure.text.splitlines():
+                    error = parse_error_line(line)
+                    if error is not None:
+                        findings += 1
+                        if packages is not None:
+                            packages.add(error[0])
+                        yield error
+            element.clear()
+            if parents:
+                parents[-1].remove(element)
+    finally:
+        timing.count("findings", findings)
+
+
+def set_fetch_options(timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES):
+    """Set options of downloads of reports in this process.
+
+    Args:
+        timeout(float): seconds to wait for connection and for every chunk
+            of response, stalled download fails after this time.
+        retries(int): number of retries of failed connections and responses
+            with status from `RETRY_STATUSES` with exponential backoff.
+    """
+    global _session
+    _fetch_options["timeout"] = timeout
+    _fetch_options["retries"] = retries
+    _session = None
+
+
+def get_session():
+    """Get requests session shared by all downloads in this process, so
+    connections to the same host are reused. Failed requests are retried
+    as set by `set_fetch_options`."""
+    global _session
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        _session = requests.Session()
+        adapter = HTTPAdapter(max_retries=Retry(
+            total=_fetch_options["retries"], backoff_factor=0.5,
+            status_forcelist=RETRY_STATUSES, raise_on_status=False))
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+    return _session
+
+
+def _get_executor(workers=None):
+    """Get pool of processes for downloading and parsing of reports which
+    use the same fetch options as this process."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    return ProcessPoolExecutor(
+        max_workers=workers, initializer=set_fetch_options,
+        initargs=(_fetch_options["timeout"], _fetch_options["retries"]))
+
+
+def is_url(source):
+    """Check if source is URL rather than path to local file.
+
+    Args:
+        source(str): URL or path to report.
+    """
+    return "://" in source
+
+
+def expand_sources(sources):
+    """Get list of report sources where glob patterns of local paths are
+    replaced by matching files.
+
+    Args:
+        sources(list): URLs, paths or glob patterns of reports.
+    """
+    expanded = []
+    for source in sources:
+        if not is_url(source) and any(x in source for x in "*?["):
+            matches = sorted(glob.glob(source))
+            if matches:
+                expanded.extend(matches)
+                continue
+        expanded.append(source)
+    return expanded
+
+
+def decompress_report(report, name):
+    """Wrap report into reader that decompresses it on the fly. Compression
+    is recognized by suffix of the name (`.gz`, `.xz` or `.zst`).
+
+    Args:
+        report: binary file-like object with report.
+        name(str): name or path of the report.
+    """
+    if name.endswith(".gz"):
+        return gzip.GzipFile(fileobj=report, mode="rb")
+    if name.endswith(".xz"):
+        if lzma is None:
+            raise ImportError("lzma module is required to read .xz reports")
+        return lzma.LZMAFile(report)
+    if name.endswith(".zst"):
+        if zstandard is None:
+            raise ImportError(
+                "zstandard module is required to read .zst reports")
+        return zstandard.ZstdDecompressor().stream_reader(report)
+    return report
+
+
+@contextlib.contextmanager
+def _map_file(report):
+    """Memory-map file if possible, otherwise use file as it is."""
+    try:
+        mapped = mmap.mmap(report.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, EnvironmentError):
+        # empty files and pipes can't be mapped
+        yield report
+        return
+    try:
+        yield mapped
+    finally:
+        mapped.close()
+
+
+@contextlib.contextmanager
+def _get_response(url, headers=None):
+    """Send streamed GET request to URL. Response can have status 304 if
+    conditional headers are provided, otherwise it has to be successful.
+    Stalled reading of response raises `requests.exceptions.ReadTimeout`.
+
+    Args:
+        url(str): URL of report.
+        headers(dict): additional headers of request.
+    """
+    import requests
+    from urllib3.exceptions import ReadTimeoutError
+
+    response = get_session().get(
+        url, stream=True, headers=headers, timeout=_fetch_options["timeout"])
+    try:
+        if response.status_code != 304:
+            response.raise_for_status()
+        response.raw.decode_content = True
+        yield response
+    except ReadTimeoutError as error:
+        raise requests.exceptions.ReadTimeout(error)
+    finally:
+        timing.count("bytes_downloaded", response.raw.tell())
+        response.close()
+
+
+def _get_local_path(source):
+    """Get path from `file://` URI, other sources are returned unchanged."""
+    if source.startswith("file://"):
+        from urllib.request import url2pathname
+        return url2pathname(urlparse(source).path)
+    return source
+
+
+@contextlib.contextmanager
+def open_report(source):
+    """Open report from rpmlint as binary file-like object.
+
+    Source can be http(s) URL, `file://` URI, path to local file or `-` for
+    standard input. Reports compressed by gzip, xz or zstd are decompressed
+    on the fly and plain local files are memory-mapped.
+
+    Args:
+        source(str): URL or path to xml with report from rpmlint.
+    """
+    if source == "-":
+        yield getattr(sys.stdin, "buffer", sys.stdin)
+        return
+    source = _get_local_path(source)
+    if is_url(source):
+        with _get_response(source) as response:
+            yield decompress_report(response.raw, urlparse(source).path)
+        return
+    with open(source, "rb") as report:
+        decompressed = decompress_report(report, source)
+        if decompressed is report:
+            with _map_file(report) as mapped:
+                yield mapped
+        else:
+            with contextlib.closing(decompressed):
+                yield decompressed
+
+
+def iter_error_list(url, testcases=None):
+    """Yield tupples where first item is package where error happened
+    and second item is error message.
+
+    The report is downloaded in chunks and parsed while it is being
+    downloaded.
+
+    Args:
+        url(str): URL or path where is located xml with report from rpmlint.
+        testcases(dict): checked source packages and their packages are
+            added to it if it is provided, see `parse_report`.
+    """
+    with open_report(url) as report:
+        for error in parse_report(report, testcases):
+            yield error
 
 
 def get_error_list(url):
@@ -9,24 +325,87 @@ def get_error_list(url):
     and second item is error message.
 
     Args:
-        url(str): URL where is located xml with report from rpmlint.
+        url(str): URL or path where is located xml with report from rpmlint.
+    """
+    return list(iter_error_list(url))
+
+
+def _get_source_error_list(source):
+    """Get list of errors from source with source appended to each error.
+
+    Args:
+        source(str): URL or path where is located xml with report from
+            rpmlint.
     """
-    xml_content = requests.get(url)
-    pattern = re.compile("(.*):\s(.):\s([^\s]+)\s(.*)")
-    error_list = []
-    e = ET.fromstring(xml_content.text)
-    for test_case in e.findall("testcase"):
-        failure = test_case.find('failure')
-        if failure is not None:
-            error_list += pattern.findall(failure.text)
-    pattern1 = re.compile("^-+$")
-    pattern2 = re.compile("^$")
-    for error_idx in range(len(error_list)):
-        error_list[error_idx] = [
-            pattern2.sub(
-                "-", pattern1.sub("-", x)) for x in error_list[error_idx]]
-
-    return error_list
+    return [error + (source,) for error in iter_error_list(source)]
+
+
+def _get_source_report(source):
+    """Get list of errors from source with source appended to each error
+    and dictionary of checked source packages and their packages.
+
+    Args:
+        source(str): URL or path where is located xml with report from
+            rpmlint.
+    """
+    testcases = {}
+    errors = [
+        error + (source,) for error in iter_error_list(source, testcases)]
+    return errors, testcases
+
+
+def _iter_results(executor, jobs, sources):
+    """Yield results of jobs of sources in the same order as sources. Jobs
+    are run in pool of processes except job of standard input, workers do
+    not inherit it and so it is read in this process meanwhile.
+
+    Args:
+        executor(ProcessPoolExecutor): pool of processes.
+        jobs(list): tupples with function and its argument for every source.
+        sources(list): URLs or paths of reports.
+    """
+    results = executor.map(timing.call_collected, [
+        job for job, source in zip(jobs, sources) if source != "-"])
+    for (function, argument), source in zip(jobs, sources):
+        if source == "-":
+            yield function(argument)
+            continue
+        result, timings = next(results)
+        timing.merge(timings)
+        yield result
+
+
+def iter_error_lists(sources, workers=None, testcases=None):
+    """Yield errors from multiple reports.
+
+    Reports are downloaded and parsed in parallel in a pool of processes,
+    standard input is parsed in this process. When there is more than one
+    report, source of the report is appended to every error tupple.
+
+    Args:
+        sources(list): URLs, paths or glob patterns of reports.
+        workers(int): Maximal number of processes. Defaults to number of
+            processors.
+        testcases(dict): checked source packages and their packages from
+            all reports are added to it if it is provided, see
+            `parse_report`.
+    """
+    sources = expand_sources(sources)
+    if len(sources) == 1:
+        for error in iter_error_list(sources[0], testcases):
+            yield error
+        return
+    function = _get_source_error_list if testcases is None else\
+        _get_source_report
+    with _get_executor(workers) as executor:
+        for error_list in _iter_results(
+                executor, [(function, x) for x in sources], sources):
+            if testcases is not None:
+                error_list, source_testcases = error_list
+                for name, packages in source_testcases.items():
+                    testcases.setdefault(name, set()).update(packages)
+            for error in error_list:
+                yield error
 
 
 def get_error_dictionary(error_list, priority_info=None):
@@ -34,13 +413,17 @@ def get_error_dictionary(error_list, priority_info=None):
     messages.
 
     Args:
-        error_list(list): List of tupples where first where first item is
-            package where error happened and second item is
-            error message.
+        error_list(iterable): List or generator of tupples where first
+            item is package where error happened and second item is
+            error message. Optional fifth item is source of the error
+            and it is collected under ``sources`` key of every error.
         priority_info(dict): Dictionary with containing error name as a key
-            and its priority as value.
+            and its priority as value. Priorities of packages set by rules
+            limited to packages are collected under ``package_priorities``
+            key of errors if they differ from priority of the error.
     """
     error_dictionary = {}
+    package_rules = has_package_rules(priority_info)
     for error in error_list:
         error_type = "Error" if error[1] == "E" else\
             "Warning" if error[1] == "W" else error[1]
@@ -49,264 +432,295 @@ def get_error_dictionary(error_list, priority_info=None):
         if error[2] not in error_dictionary[error_type]:
             error_dictionary[error_type][error[2]] = {}
             error_dictionary[error_type][error[2]]["detail"] = {}
-            if priority_info:
-                if error[2] in priority_info:
-                    error_dictionary[error_type][error[2]]["priority"] =\
-                        priority_info[error[2]]
-                else:
-                    error_dictionary[error_type][error[2]]["priority"] = 0
-            else:
-                error_dictionary[error_type][error[2]]["priority"] = None
+            error_dictionary[error_type][error[2]]["priority"] =\
+                get_priority(priority_info, error[2])
         if error[3] not in error_dictionary[error_type][error[2]]["detail"]:
             error_dictionary[error_type][error[2]]["detail"][error[3]] = []
         error_dictionary[error_type][error[2]]["detail"][error[3]].append(
             error[0])
+        if len(error) > 4:
+            sources = error_dictionary[error_type][error[2]].setdefault(
+                "sources", {}).setdefault(error[0], [])
+            if error[4] not in sources:
+                sources.append(error[4])
+        if package_rules:
+            priority = get_priority(priority_info, error[2], error[0])
+            if priority != error_dictionary[error_type][error[2]]["priority"]:
+                error_dictionary[error_type][error[2]].setdefault(
+                    "package_priorities", {})[error[0]] = priority
     return error_dictionary
 
 
+@timing.timed("parse")
+def get_error_index(error_list, priority_info=None, testcases=None):
+    """Creates compact reverse index of errors. It provides the same
+    information as `get_error_dictionary` with much lower memory usage.
+
+    Args:
+        error_list(iterable): List or generator of tupples where first
+            item is package where error happened and second item is
+            error message.
+        priority_info(dict): Dictionary with containing error name as a key
+            and its priority as value.
+        testcases(dict): checked source packages and their packages filled
+            while error_list is parsed, see `parse_report`. They are
+            recorded in index after all errors are added.
+    """
+    error_index = ErrorIndex(priority_info).update(error_list)
+    if testcases:
+        error_index.add_testcases(testcases)
+    return error_index
+
+
+def get_package_dictionary(error_dictionary):
+    """Creates dictionary where key is package and value contains name of
+    its source package and its errors by severity and error name.
+
+    Args:
+        error_dictionary(dict): dictionary object with information
+            about errors and warnings.
+    """
+    package_dictionary = {}
+    for error_type in error_dictionary.keys():
+        for error in error_dictionary[error_type].keys():
+            details = error_dictionary[error_type][error]["detail"]
+            for detail in details.keys():
+                for package in details[detail]:
+                    if package not in package_dictionary:
+                        package_dictionary[package] = {
+                            "source_package": get_source_package_name(
+                                package),
+                            "errors": {}}
+                    package_dictionary[package]["errors"].setdefault(
+                        error_type, {}).setdefault(error, []).append(detail)
+    return package_dictionary
+
+
+def dumps_json(obj):
+    """Serialize object to JSON string by the fastest available encoder.
+
+    Args:
+        obj: object that is serialized.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
+def write_ndjson(stream, error_list, priority_info=None):
+    """Write one JSON record per line for every error as soon as it is
+    read from error list.
+
+    Args:
+        stream: file-like object where records are written.
+        error_list(iterable): List or generator of error tupples.
+        priority_info(dict): Dictionary with containing error name as a key
+            and its priority as value.
+    """
+    for error in error_list:
+        record = {
+            "package": error[0],
+            "severity": get_severity_name(error[1]),
+            "tag": error[2],
+            "detail": error[3],
+            "priority": get_priority(priority_info, error[2], error[0])}
+        if len(error) > 4:
+            record["source"] = error[4]
+        stream.write(dumps_json(record))
+        stream.write("\n")
+
+
+def get_finding_key(error):
+    """Get hashable key identifying finding regardless of its source.
+
+    Args:
+        error(tuple): package, severity, error name, detail and optionally
+            source of the error.
+    """
+    return (error[0], get_severity_name(error[1]), error[2], error[3])
+
+
+def get_error_diff(old_error_list, new_error_list, priority_info=None):
+    """Compare errors from two reports.
+
+    Args:
+        old_error_list(iterable): List or generator of errors from older
+            report.
+        new_error_list(iterable): List or generator of errors from newer
+            report.
+        priority_info(dict): Dictionary with containing error name as a key
+            and its priority as value.
+
+    Returns:
+        dict: `added` and `removed` errors in the same format as
+            `get_error_dictionary` and number of `unchanged` errors.
+    """
+    old_keys = set(get_finding_key(x) for x in old_error_list)
+    new_keys = set(get_finding_key(x) for x in new_error_list)
+    added = new_keys - old_keys
+    removed = old_keys - new_keys
+    return {
+        "added": get_error_dictionary(sorted(added), priority_info),
+        "removed": get_error_dictionary(sorted(removed), priority_info),
+        "unchanged": len(new_keys) - len(added)}
+
+
+def get_file_hash(path):
+    """Get SHA-256 of content of file.
+
+    Args:
+        path(str): path to file.
+    """
+    file_hash = hashlib.sha256()
+    with open(path, "rb") as file_o:
+        for chunk in iter(lambda: file_o.read(2 ** 20), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def _get_cached_source_index(args):
+    """Get index of errors from one report, index is loaded from cache if
+    the report didn't change. Entry of the report is missing in cache if
+    it was evicted meanwhile and the report is parsed again then.
+
+    Args:
+        args(tuple): URL or path of report, cache, priority info and
+            optionally whether least recently used entries are evicted
+            after storing new one.
+    """
+    source, cache, priority_info = args[:3]
+    evict = args[3] if len(args) > 3 else True
+    testcases = {}
+    if source == "-":
+        return get_error_index(
+            iter_error_list(source, testcases), priority_info, testcases)
+    key = cache.get_key(source, priority_info)
+    validators = cache.get_validators(key)
+    if is_url(_get_local_path(source)):
+        headers = {}
+        if validators and validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators and validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        with _get_response(source, headers) as response:
+            if response.status_code == 304 and validators:
+                error_index = cache.load(key)
+                if error_index is None:
+                    return _get_cached_source_index(args)
+                return error_index
+            new_validators = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified")}
+            error_index = get_error_index(parse_report(decompress_report(
+                response.raw, urlparse(source).path), testcases),
+                priority_info, testcases)
+    else:
+        new_validators = {"sha256": get_file_hash(_get_local_path(source))}
+        error_index = cache.load(key) if validators == new_validators\
+            else None
+        if error_index is not None:
+            return error_index
+        error_index = get_error_index(
+            iter_error_list(source, testcases), priority_info, testcases)
+    cache.store(key, new_validators, error_index, evict)
+    return error_index
+
+
+@timing.timed("parse")
+def get_cached_error_index(sources, cache, priority_info=None, workers=None):
+    """Creates compact reverse index of errors from reports like
+    `get_error_index` with `iter_error_lists`, but parsed reports are
+    stored in cache. Unchanged URLs are recognized by conditional requests
+    with ETag or Last-Modified of cached response and local files by hash
+    of their content.
+
+    Args:
+        sources(list): URLs, paths or glob patterns of reports.
+        cache(ReportCache): cache of parsed reports.
+        priority_info(dict): Dictionary with containing error name as a key
+            and its priority as value.
+        workers(int): Maximal number of processes. Defaults to number of
+            processors.
+    """
+    sources = expand_sources(sources)
+    if len(sources) == 1:
+        return _get_cached_source_index((sources[0], cache, priority_info))
+    with _get_executor(workers) as executor:
+        indexes = _iter_results(executor, [
+            (_get_cached_source_index, (x, cache, priority_info, False))
+            for x in sources], sources)
+        error_index = ErrorIndex(priority_info)
+        for source, source_index in zip(sources, indexes):
+            error_index.update(
+                error + (source,) for error in source_index.iter_errors())
+            error_index.add_testcases(source_index.get_testcases())
+    # Workers only store entries, concurrent eviction could remove entries
+    # other workers are loading.
+    cache.evict()
+    return error_index
+
+
+def get_error_statistics(error_info):
+    """Get dictionary with number of distinct packages, number of
+    occurrences, number of distinct details and priority of error.
+
+    Args:
+        error_info(dict): details and priority of error from
+            `get_error_dictionary`.
+    """
+    packages = set()
+    occurrences = 0
+    for detail_packages in error_info["detail"].values():
+        packages.update(detail_packages)
+        occurrences += len(detail_packages)
+    return {
+        "packages": len(packages),
+        "occurrences": occurrences,
+        "details": len(error_info["detail"]),
+        "priority": error_info["priority"]}
+
+
 def load_priority_info(path):
-    """Loads a dictionary containing error name as a key and its priority
-    as its value from configuration file on given path.
+    """Loads priority rules from configuration file on given path. Rules
+    can be used like a dictionary containing error name as a key and its
+    priority as its value, see `PriorityRules` for format of rules.
 
     Args:
         path(str): Path to configuration file.
     """
-    with open(path) as priority_file:
-        content = priority_file.readlines()
-    configuration = dict(x.strip().split(None, 1) for x in content)
-    return configuration
-
-
-class HTMLGenerator:
-    """Handle html output for provided dictionary/list."""
-
-    def __init__(self, error_dictionary):
-        self.error_dictionary = error_dictionary
-        self.output = ""
-
-    def nice_error_format(self, detail_dictionary):
-        """Get Html 2 level list with error details and relevant packages.
-
-        Args:
-            detail_dictionary(dict): key is error and values are packages.
-        """
-        output = ""
-        for detail in detail_dictionary.keys():
-            output += "<h4>{}</h4><ul><li>".format(detail)
-            output += "</li><li>".join(detail_dictionary[detail])
-            output += "</li></ul>"
-        return output
-
-    def convert_dictionary_to_list(self, obj, indent=0, error_type="Warning"):
-        """Creates recursively html list structure from dictionary/list.
-
-        Args:
-            obj: dictionary, list or string that is turned into a html.
-        """
-        if obj:
-            if type(obj) is dict:
-                for k, v in obj.items():
-                    if indent == 0:
-                        error_type = k
-                    self.output +=\
-                        '\n{}<li><a class="item" href="#">{}</a>'.format(
-                                    '  ' * (indent+1), k)
-
-                    # Add link to error description
-                    if indent == 2 and error_type == "Error":
-                        self.output += (
-                                        " <a href='http://wiki.rosalab.ru/en/"
-                                        "index.php/Rpmlint_Errors#{}' target="
-                                        "'_blank'>details</a>".format(k))
-                    self.output += '\n{}<ul>'.format('  ' * (indent+1))
-                    self.convert_dictionary_to_list(v, indent+2, error_type)
-                    self.output += '\n{}</ul>'.format('  ' * (indent+1))
-                    self.output += '\n{}</li>'.format(
-                        '  ' * (indent+1))
-            elif type(obj) is list:
-                for k, v in enumerate(obj):
-                    self.convert_dictionary_to_list(v, indent+1, error_type)
-            elif type(obj) is str:
-                self.output += '\n{}<li>{}</li>'.format(
-                                    '  ' * (indent+1), obj)
-
-    def get_html_header(self, position=""):
-        """Generate string containing html header.
-
-        Args:
-            position(str): relative or absolute position of sources."""
-        return """<html>
-    <head><title>Rpmlint list</title>
-<meta charset=\"utf-8\" />
-<meta name=\"viewport\" content=\"initial-scale=1.0;
-maximum-scale=1.0; width=device-width;\">
-<link rel=\"stylesheet\" href=\"{}sources/style.css\">
-<script src=\"{}sources/sorttable.js\"></script>
-<style>th{{background-color:#e0e0e0;color:#000;}}
-table{{margin: 50 50 50 50}}
-h1{{margin-left: 50}}</style>
-    </head>
-    <body>""".format(position, position)
-
-    def get_html_footer(self, scripts=None):
-        """Geenrate string containing html footer.
-
-        Args:
-            scripts(str): String that is put before </body> tag.
-        """
-        if scripts:
-            return """{}
-    </body>
-</html>""".format(scripts)
-        else:
-            return "</body></html>"
-
-    def download_sources(self, directory):
-        """Download and save css and js files into directory.
-
-        Args:
-            directory(str): path to directory with sources.
-        """
-        directory = os.path.join(directory, "sources")
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-        request_js = requests.get(
-            "https://kryogenix.org/code/browser/sorttable/sorttable.js")
-        with open(os.path.join(directory, "sorttable.js"), "w+") as file_js:
-                file_js.write(request_js.text)
-
-        request_css = requests.get(
-            "https://unpkg.com/purecss@1.0.0/build/pure-min.css")
-        with open(os.path.join(directory, "style.css"), "w+") as file_css:
-                file_css.write(request_css.text)
-
-    def generate_html_list(self):
-        """Generates html artefacts containing list of packages and for each
-        package list of errors.
-
-        Args:
-            error_dictionary(dictionary): dictionary where key is rpm package
-                and vulues are error messages.
-        """
-        self.output = ""
-        self.convert_dictionary_to_list(self.error_dictionary)
-        scripts = """<script type='text/javascript' \
-src="js/CollapsibleLists.js"></script>
-<script>CollapsibleLists.apply()</script>"""
-        content = """{}
-        <ul class="collapsibleList">
-        {}
-        </ul>
-{}""".format(
-            self.get_html_header(), self.output, self.get_html_footer(scripts))
-        return content
-
-    def convert_dictionary_to_table(self, error_dictionary, error_type, error):
-        """Generate html table with two columns.
-
-        Args:
-            error_dictionary(dictionary): dictionary where key is rpm package
-                and values are error messages.
-        """
-        packages = {}
-        errors = []
-        for detail in error_dictionary["detail"].keys():
-            error_detail = "{} {}".format(error, detail)
-            errors.append(error_detail)
-            packages[error_detail] = error_dictionary["detail"][detail]
-        if error_type == "Error":
-            url = "https://fedoraproject.org/wiki/ParagNemade/\
-CommonRpmlintErrors#{}".format(error)
-        else:
-            url = None
-        cells = "<tr><th>Name:</th><td>{}</td></tr>".format(error)
-        cells += "<tr><th>Severity:</th><td>{}</td></tr>".format(error_type)
-        cells += "<tr><th>Details:</th><td>{}</td></tr>".format(
-            self.nice_error_format(packages))
-        if url:
-            cells += """<tr><th>URL:</th><td><a href=\"{}\">{}</a></td>
-                </tr>""".format(url, url)
-        if error_dictionary["priority"]:
-            cells += "<tr><th>Priority:</th><td>{}</td></tr>".format(
-                error_dictionary["priority"])
-
-        table = "<table class=\"pure-table pure-table-horizontal\">{}</table>"\
-                .format(cells)
-        return table
-
-    def generate_detail(self, error_dictionary, error_type, error):
-        """Generates html artefacts containing table with error or warning
-        details.
-
-        Args:
-            error_dictionary(dictionary): dictionary where key is rpm package
-                and values are error messages.
-        """
-        table = self.convert_dictionary_to_table(
-            error_dictionary,
-            error_type,
-            error)
-        # self.convert_dictionary(self.error_dictionary)
-        content = """{}
-        {}
-{}""".format(self.get_html_header("../"), table, self.get_html_footer())
-        return content
-
-    def generate_error_list(self, error_dictionary):
-        """Generate sortable table with errors and their statisctics.
-
-        Args:
-            error_dictionary(dict): dictionary object with information
-                about errors and warnings.
-        """
-        output = ""
-        for error_severity in error_dictionary.keys():
-            output += "<h1>{}</h1>".format(error_severity)
-            output += "<table class=\"sortable pure-table\"><thead><tr>"
-            output += "<th>Name</th><th>Number of packages</th>"
-            output += "<th>Priority</th><th>Details</th></thead><tbody>"
-            for error in error_dictionary[error_severity].keys():
-                output += "<tr><td>{}</td>".format(error)
-                pkg_count = 0
-                for detail in\
-                        error_dictionary[error_severity][error]["detail"]:
-                    pkg_count += len(error_dictionary[error_severity]
-                                     [error]["detail"][detail])
-                output += "<td>{}</td>".format(pkg_count)
-                output += "<td>{}</td>".format(
-                    error_dictionary[error_severity][error]["priority"])
-                output += "<td><a href='{}/{}.html'>link</a></td>".format(
-                    error_severity.lower(), error)
-                output += "</tr>"
-            output += "</tbody></table>"
-        return output
-
-    def generate_details(self, error_dictionary, path):
-        """Generate html page for each error in error_dictionary on given path.
-
-        Args:
-            error_dictionary(dict): dictionary object with information
-                about errors and warnings.
-        """
-        if not os.path.exists(path):
-            raise OSError(2, 'No such file or directory', path)
-
-        tables = self.generate_error_list(error_dictionary)
-        self.download_sources(path)
-
-        with open(os.path.join(path, "index.html"), "w+") as file_o:
-            file_o.write("{}{}{}".format(
-                self.get_html_header(), tables, self.get_html_footer()))
-
-        for error_type in error_dictionary.keys():
-            for error in error_dictionary[error_type].keys():
-                content = self.generate_detail(
-                    error_dictionary[error_type][error], error_type, error)
-
-                directory = os.path.join(path, error_type.lower())
-                if not os.path.exists(directory):
-                    os.makedirs(directory)
-                with open(
-                    os.path.join(
-                        directory, "{}.html".format(error)), "w+") as file_o:
-                    file_o.write(content)
+    return PriorityRules.load(path)
+
+
+# Html output is generated by `rpmlint_list.html`, the module is imported
+# when these functions are called for the first time.
+
+
+def HTMLGenerator(error_dictionary):
+    """Get `rpmlint_list.html.HTMLGenerator` for error dictionary."""
+    from rpmlint_list import html
+    return html.HTMLGenerator(error_dictionary)
+
+
+def get_error_page_name(error, page=1):
+    """See `rpmlint_list.html.get_error_page_name`."""
+    from rpmlint_list import html
+    return html.get_error_page_name(error, page)
+
+
+def get_search_shard_name(package):
+    """See `rpmlint_list.html.get_search_shard_name`."""
+    from rpmlint_list import html
+    return html.get_search_shard_name(package)
+
+
+def get_search_index(error_dictionary, package_dictionary, error_pages):
+    """See `rpmlint_list.html.get_search_index`."""
+    from rpmlint_list import html
+    return html.get_search_index(
+        error_dictionary, package_dictionary, error_pages)
+
+
+def split_error_info(error_info, page_size=None):
+    """See `rpmlint_list.html.split_error_info`."""
+    from rpmlint_list import html
+    return html.split_error_info(error_info, page_size)
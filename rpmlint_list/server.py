@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+
+"""HTTP service answering queries from error index kept in memory."""
+
+import gzip
+import hashlib
+import io
+import json
+import mimetypes
+import os
+import threading
+import time
+import traceback
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import unquote, urlparse
+
+# Responses smaller than this are not compressed.
+MIN_GZIP_SIZE = 1024
+# Maximal number of cached API responses of one index.
+MAX_CACHED_RESPONSES = 4096
+COMPRESSED_TYPES = ("text/", "application/json", "application/javascript")
+
+
+class Snapshot(object):
+    """Index loaded at one moment with cache of its API responses.
+
+    Args:
+        error_index(ErrorIndex): loaded index.
+        version(str): identifier of this snapshot used in ETags.
+        directory(str): path of web application generated for the index
+            or None.
+    """
+
+    def __init__(self, error_index, version, directory=None):
+        self.error_index = error_index
+        self.version = version
+        self.directory = directory
+        self.responses = {}
+
+
+class IndexHolder(object):
+    """Keeps current index in memory and reloads it periodically in
+    background thread. New index replaces the old one at once, so requests
+    are always answered from a complete index. Old index is kept when
+    reloading fails.
+
+    Args:
+        load(function): function without arguments returning `ErrorIndex`
+            or tupple with `ErrorIndex` and path of web application
+            generated for it, which is then served with the index.
+        interval(float): seconds between reloads, index is not reloaded in
+            background if it is not provided.
+    """
+
+    def __init__(self, load, interval=None):
+        self.load = load
+        self.interval = interval
+        self.generation = 0
+        self.snapshot = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.refresh()
+
+    def refresh(self):
+        """Load index and replace the current one."""
+        loaded = self.load()
+        error_index, directory = loaded if isinstance(loaded, tuple)\
+            else (loaded, None)
+        self.generation += 1
+        self.snapshot = Snapshot(error_index, "{:x}-{}".format(
+            int(time.time()), self.generation), directory)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception:
+                traceback.print_exc()
+
+    def start(self):
+        """Start reloading of index in background thread."""
+        if self.interval and self._thread is None:
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self):
+        """Stop reloading of index."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def get_tag(error_index, error):
+    """Get statistics, details and sources of error for every severity
+    where it was reported or None if it is unknown.
+
+    Args:
+        error_index(ErrorIndex): index of errors.
+        error(str): name of error.
+    """
+    tag = {}
+    for severity in error_index.get_severities():
+        try:
+            statistics = error_index.get_statistics(severity, error)
+        except KeyError:
+            continue
+        tag[severity] = {
+            "statistics": statistics,
+            "detail": error_index.get_details(severity, error)}
+        sources = error_index.get_sources(severity, error)
+        if sources is not None:
+            tag[severity]["sources"] = sources
+    return tag or None
+
+
+def get_package(error_index, package):
+    """Get source package and errors of package or None if it is unknown.
+
+    Args:
+        error_index(ErrorIndex): index of errors.
+        package(str): name of binary package.
+    """
+    errors = error_index.get_package_errors(package)
+    if not errors:
+        return None
+    package_info = {
+        "source_package": error_index.get_source_package(package),
+        "errors": {}}
+    for severity, error, detail in errors:
+        package_info["errors"].setdefault(severity, {}).setdefault(
+            error, []).append(detail)
+    return package_info
+
+
+def get_severity(error_index, severity):
+    """Get statistics of all errors with severity or None if there is no
+    such error.
+
+    Args:
+        error_index(ErrorIndex): index of errors.
+        severity(str): name of severity.
+    """
+    errors = error_index.get_errors(severity)
+    if not errors:
+        return None
+    return dict(
+        (x, error_index.get_statistics(severity, x)) for x in errors)
+
+
+def compress(content_type, body):
+    """Get body compressed by gzip or None if it is not worth it.
+
+    Args:
+        content_type(str): MIME type of body.
+        body(bytes): content of response.
+    """
+    if len(body) < MIN_GZIP_SIZE or\
+            not content_type.startswith(COMPRESSED_TYPES):
+        return None
+    stream = io.BytesIO()
+    with gzip.GzipFile(fileobj=stream, mode="wb", mtime=0) as gzip_file:
+        gzip_file.write(body)
+    return stream.getvalue()
+
+
+def get_api_response(error_index, path):
+    """Get object answering API query or None if it doesn't exist.
+
+    Args:
+        error_index(ErrorIndex): index of errors.
+        path(str): path of query without `/api/` prefix, e.g.
+            `summary`, `severities`, `severity/Error`, `tag/zero-length` or
+            `package/foo.x86_64`.
+    """
+    if path == "summary":
+        return error_index.get_summary()
+    if path == "severities":
+        return dict(
+            (x, error_index.get_errors(x))
+            for x in error_index.get_severities())
+    kind, _, name = path.partition("/")
+    if kind == "severity":
+        return get_severity(error_index, name)
+    if kind == "tag":
+        return get_tag(error_index, name)
+    if kind == "package":
+        return get_package(error_index, name)
+    return None
+
+
+class IndexServer(ThreadingMixIn, HTTPServer):
+    """Threading HTTP server answering queries from index in holder and
+    serving files of web application from directory.
+
+    Args:
+        address(tuple): host and port.
+        holder(IndexHolder): holder of index.
+        directory(str): path of web application generated by
+            `HTMLGenerator.generate_details` or None. Directory of the
+            current snapshot of holder is served instead if it has one.
+        quiet(bool): do not log requests.
+    """
+    daemon_threads = True
+
+    def __init__(self, address, holder, directory=None, quiet=False):
+        HTTPServer.__init__(self, address, RequestHandler)
+        self.holder = holder
+        self.directory = directory
+        self.quiet = quiet
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """Handler of requests of `IndexServer`. Responses have ETag, so
+    repeated requests are answered by status 304 until index or file
+    changes, and they are compressed by gzip if client accepts it."""
+
+    def do_GET(self):
+        self.send_body(*self.get_body())
+
+    def do_HEAD(self):
+        self.send_body(*self.get_body(), head=True)
+
+    def get_body(self):
+        """Get status, content type, ETag, content of response and the
+        content compressed by gzip or None."""
+        path = unquote(urlparse(self.path).path)
+        if path.startswith("/api/"):
+            return self.get_api_body(path[len("/api/"):])
+        return self.get_file_body(path)
+
+    def is_fresh(self, etag):
+        """Check if client already has response with ETag."""
+        tags = self.headers.get("If-None-Match", "")
+        return etag in [x.strip() for x in tags.split(",")]
+
+    def get_api_body(self, path):
+        snapshot = self.server.holder.snapshot
+        etag = '"{}-{}"'.format(snapshot.version, hashlib.sha1(
+            path.encode("utf-8")).hexdigest()[:16])
+        if self.is_fresh(etag):
+            return 304, None, etag, b"", None
+        response = snapshot.responses.get(path)
+        if response is None:
+            try:
+                content = get_api_response(snapshot.error_index, path)
+            except KeyError:
+                content = None
+            if content is None:
+                return 404, "application/json", None, json.dumps(
+                    {"error": "not found"}).encode("utf-8"), None
+            body = json.dumps(content, sort_keys=True).encode("utf-8")
+            response = (body, compress("application/json", body))
+            if len(snapshot.responses) < MAX_CACHED_RESPONSES:
+                snapshot.responses[path] = response
+        return (200, "application/json", etag) + response
+
+    def get_file_body(self, path):
+        directory = self.server.holder.snapshot.directory or\
+            self.server.directory
+        if directory is None:
+            return 404, "text/plain", None, b"Not found", None
+        if path.endswith("/"):
+            path += "index.html"
+        root = os.path.realpath(directory)
+        file_path = os.path.realpath(os.path.join(root, path.lstrip("/")))
+        if not file_path.startswith(root + os.sep) or\
+                not os.path.isfile(file_path):
+            return 404, "text/plain", None, b"Not found", None
+        stat = os.stat(file_path)
+        etag = '"{:x}-{:x}"'.format(int(stat.st_mtime * 1000), stat.st_size)
+        if self.is_fresh(etag):
+            return 304, None, etag, b"", None
+        content_type = mimetypes.guess_type(file_path)[0] or\
+            "application/octet-stream"
+        with open(file_path, "rb") as file_o:
+            body = file_o.read()
+        return 200, content_type, etag, body, compress(content_type, body)
+
+    def send_body(self, status, content_type, etag, body, compressed,
+                  head=False):
+        """Send response, compressed body is sent if client accepts gzip."""
+        if compressed is not None and\
+                "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = compressed
+        else:
+            compressed = None
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if compressed is not None:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head and status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
@@ -0,0 +1,100 @@
+/* Search packages in shards of search index loaded on demand. */
+(function () {
+    "use strict";
+
+    var PREFIX_LENGTH = 2;
+    var MAX_RESULTS = 100;
+    var tags = [];
+    var shards = {};
+    var pending = {};
+
+    function getShardName(query) {
+        return query.slice(0, PREFIX_LENGTH).toLowerCase()
+            .replace(/[^a-z0-9]/g, "_");
+    }
+
+    function link(href, text) {
+        var anchor = document.createElement("a");
+        anchor.href = href;
+        anchor.textContent = text;
+        return anchor;
+    }
+
+    function render(query, packages) {
+        var results = document.getElementById("results");
+        var names = Object.keys(packages).filter(function (name) {
+            return name.toLowerCase().indexOf(query) === 0;
+        }).sort();
+        results.textContent = "";
+        if (!names.length) {
+            results.textContent = "No packages found.";
+            return;
+        }
+        names.slice(0, MAX_RESULTS).forEach(function (name) {
+            var item = document.createElement("li");
+            item.appendChild(link("packages/" + name + ".html", name));
+            item.appendChild(document.createTextNode(": "));
+            packages[name].forEach(function (tag, position) {
+                if (position) {
+                    item.appendChild(document.createTextNode(", "));
+                }
+                item.appendChild(link(tags[tag][2], tags[tag][1]));
+            });
+            results.appendChild(item);
+        });
+        if (names.length > MAX_RESULTS) {
+            var rest = document.createElement("li");
+            rest.textContent = "... " + (names.length - MAX_RESULTS) +
+                " more packages";
+            results.appendChild(rest);
+        }
+    }
+
+    function search() {
+        var query = document.getElementById("query").value.trim()
+            .toLowerCase();
+        var name = getShardName(query);
+        if (!query) {
+            document.getElementById("results").textContent = "";
+            return;
+        }
+        if (query.length < PREFIX_LENGTH) {
+            document.getElementById("results").textContent =
+                "Type at least " + PREFIX_LENGTH + " characters.";
+            return;
+        }
+        if (shards.hasOwnProperty(name)) {
+            render(query, shards[name]);
+            return;
+        }
+        if (pending[name]) {
+            return;
+        }
+        pending[name] = true;
+        var script = document.createElement("script");
+        script.src = "search/" + name + ".js";
+        script.onerror = function () {
+            shards[name] = {};
+            search();
+        };
+        document.head.appendChild(script);
+    }
+
+    window.rpmlintSearch = {
+        tags: function (value) {
+            tags = value;
+        },
+        load: function (name, packages) {
+            shards[name] = packages;
+            search();
+        }
+    };
+
+    document.addEventListener("DOMContentLoaded", function () {
+        var query = document.getElementById("query");
+        if (query) {
+            query.addEventListener("input", search);
+            search();
+        }
+    });
+}());
@@ -0,0 +1,52 @@
+/* Make tables with class "sortable" sortable by click on column header. */
+(function () {
+    "use strict";
+
+    function cellValue(row, column) {
+        var cell = row.cells[column];
+        return cell ? (cell.textContent || "").trim() : "";
+    }
+
+    function compare(a, b) {
+        var x = parseFloat(a), y = parseFloat(b);
+        if (!isNaN(x) && !isNaN(y) && String(x) === a && String(y) === b) {
+            return x - y;
+        }
+        return a.localeCompare(b);
+    }
+
+    function sortTable(table, column, descending) {
+        var body = table.tBodies[0];
+        var rows = Array.prototype.slice.call(body.rows);
+        rows.sort(function (a, b) {
+            var result = compare(cellValue(a, column), cellValue(b, column));
+            return descending ? -result : result;
+        });
+        rows.forEach(function (row) {
+            body.appendChild(row);
+        });
+    }
+
+    function makeSortable(table) {
+        if (!table.tHead || !table.tBodies.length) {
+            return;
+        }
+        var headers = table.tHead.rows[0].cells;
+        Array.prototype.forEach.call(headers, function (header, column) {
+            header.style.cursor = "pointer";
+            header.addEventListener("click", function () {
+                var descending = header.getAttribute("data-sort") === "asc";
+                Array.prototype.forEach.call(headers, function (other) {
+                    other.removeAttribute("data-sort");
+                });
+                header.setAttribute("data-sort", descending ? "desc" : "asc");
+                sortTable(table, column, descending);
+            });
+        });
+    }
+
+    document.addEventListener("DOMContentLoaded", function () {
+        var tables = document.querySelectorAll("table.sortable");
+        Array.prototype.forEach.call(tables, makeSortable);
+    });
+}());
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+"""SQLite storage of rpmlint errors."""
+
+import sqlite3
+
+COLUMNS = ("package", "severity", "tag", "detail", "source", "priority")
+
+CREATE_TABLE = """CREATE TABLE findings (
+    package TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    detail TEXT NOT NULL,
+    source TEXT,
+    priority TEXT)"""
+
+CREATE_INDEXES = (
+    "CREATE INDEX findings_package ON findings (package)",
+    "CREATE INDEX findings_tag ON findings (tag)")
+
+
+class SQLiteStore(object):
+    """Table of findings in SQLite database with indexes on package and
+    error name (tag).
+
+    Args:
+        path(str): path to database file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path, isolation_level=None)
+
+    def close(self):
+        """Close connection to database."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, error_index):
+        """Replace content of database by errors from index. All findings are
+        inserted in a single transaction and indexes are created after the
+        insertion.
+
+        Args:
+            error_index(ErrorIndex): index of errors.
+        """
+        priorities = {}
+
+        def get_rows():
+            for error in error_index.iter_errors():
+                if error[1:3] not in priorities:
+                    priorities[error[1:3]] = (
+                        error_index.get_priority(error[1], error[2]),
+                        error_index.get_package_priorities(
+                            error[1], error[2]) or {})
+                priority, package_priorities = priorities[error[1:3]]
+                priority = package_priorities.get(error[0], priority)
+                yield (
+                    error[0], error[1], error[2], error[3],
+                    error[4] if len(error) > 4 else None,
+                    None if priority is None else str(priority))
+
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN")
+        try:
+            cursor.execute("DROP TABLE IF EXISTS findings")
+            cursor.execute(CREATE_TABLE)
+            cursor.executemany(
+                "INSERT INTO findings VALUES (?, ?, ?, ?, ?, ?)", get_rows())
+            for statement in CREATE_INDEXES:
+                cursor.execute(statement)
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+    def get_packages(self, tag):
+        """Get sorted list of packages where error was reported.
+
+        Args:
+            tag(str): name of error.
+        """
+        return [x[0] for x in self.connection.execute(
+            "SELECT DISTINCT package FROM findings WHERE tag = ? "
+            "ORDER BY package", (tag,))]
+
+    def get_package_errors(self, package):
+        """Get list of tupples with severity, error name and detail of errors
+        reported for package.
+
+        Args:
+            package(str): name of package.
+        """
+        return self.connection.execute(
+            "SELECT severity, tag, detail FROM findings WHERE package = ? "
+            "ORDER BY severity, tag, detail", (package,)).fetchall()
+
+    def get_top_errors(self, limit=10):
+        """Get list of tupples with severity, error name and number of
+        packages for errors reported for the most packages.
+
+        Args:
+            limit(int): maximal number of errors.
+        """
+        return self.connection.execute(
+            "SELECT severity, tag, COUNT(DISTINCT package) AS packages "
+            "FROM findings GROUP BY severity, tag "
+            "ORDER BY packages DESC, tag LIMIT ?", (limit,)).fetchall()
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+"""Collecting of wall time of processing stages and related counters.
+
+Library functions report their stages by `stage` and counters by `count`.
+Both are no-ops unless metrics are collected by `collect`::
+
+    with timing.collect() as timings:
+        error_index = get_error_index(iter_error_lists(urls))
+    print(timings.format())
+"""
+
+import contextlib
+import functools
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+_timings = None
+
+
+class Timings(object):
+    """Wall time of stages and counters such as number of findings, bytes
+    downloaded and files written. Time of a stage entered again while it
+    is running is counted only once."""
+
+    def __init__(self):
+        self.start = time.time()
+        self.stages = []
+        self.durations = {}
+        self.counters = {}
+        self.running = set()
+
+    def add_stage(self, name, duration):
+        """Add duration in seconds to stage.
+
+        Args:
+            name(str): name of stage.
+            duration(float): wall time in seconds.
+        """
+        if name not in self.durations:
+            self.stages.append(name)
+            self.durations[name] = 0.0
+        self.durations[name] += duration
+
+    def count(self, name, value=1):
+        """Increase counter.
+
+        Args:
+            name(str): name of counter.
+            value(int): value added to counter.
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def merge(self, other):
+        """Add counters and durations of stages collected in other process.
+
+        Args:
+            other(Timings): collected metrics.
+        """
+        for name in other.stages:
+            if name not in self.running:
+                self.add_stage(name, other.durations[name])
+        for name, value in other.counters.items():
+            self.count(name, value)
+
+    def get_record(self):
+        """Get dictionary with wall time of stages, counters, findings per
+        second and peak resident set size in bytes."""
+        total = time.time() - self.start
+        findings = self.counters.get("findings", 0)
+        parse = self.durations.get("parse", total)
+        return {
+            "total": total,
+            "stages": dict(self.durations),
+            "counters": dict(self.counters),
+            "findings_per_second": findings / parse if parse else 0.0,
+            "peak_rss": get_peak_rss()}
+
+    def format(self):
+        """Get human readable report of collected metrics."""
+        record = self.get_record()
+        lines = ["{:<24}{:>10.3f} s".format(name, self.durations[name])
+                 for name in self.stages]
+        lines.append("{:<24}{:>10.3f} s".format("total", record["total"]))
+        lines.extend("{:<24}{:>10}".format(name, value)
+                     for name, value in sorted(record["counters"].items()))
+        lines.append("{:<24}{:>10.0f}".format(
+            "findings_per_second", record["findings_per_second"]))
+        if record["peak_rss"] is not None:
+            lines.append("{:<24}{:>10.1f} MiB".format(
+                "peak_rss", record["peak_rss"] / 2.0 ** 20))
+        return "\n".join(lines)
+
+
+def get_peak_rss():
+    """Get peak resident set size of this process and its finished children
+    in bytes or None if it is not available on this platform."""
+    if resource is None:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@contextlib.contextmanager
+def collect(timings=None):
+    """Collect metrics reported by library functions in this process.
+
+    Args:
+        timings(Timings): collector of metrics, new one is created if it is
+            not provided.
+    """
+    global _timings
+    previous = _timings
+    _timings = timings or Timings()
+    try:
+        yield _timings
+    finally:
+        _timings = previous
+
+
+@contextlib.contextmanager
+def stage(name):
+    """Measure wall time of stage if metrics are collected.
+
+    Args:
+        name(str): name of stage.
+    """
+    timings = _timings
+    if timings is None or name in timings.running:
+        yield
+        return
+    timings.running.add(name)
+    start = time.time()
+    try:
+        yield
+    finally:
+        timings.running.discard(name)
+        timings.add_stage(name, time.time() - start)
+
+
+def timed(name):
+    """Decorator measuring wall time of function as stage.
+
+    Args:
+        name(str): name of stage.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, value=1):
+    """Increase counter if metrics are collected.
+
+    Args:
+        name(str): name of counter.
+        value(int): value added to counter.
+    """
+    if _timings is not None:
+        _timings.count(name, value)
+
+
+def merge(timings):
+    """Add metrics collected in other process if metrics are collected.
+
+    Args:
+        timings(Timings): collected metrics.
+    """
+    if _timings is not None:
+        _timings.merge(timings)
+
+
+def call_collected(job):
+    """Call function and collect its metrics, used in pools of processes.
+
+    Args:
+        job(tuple): function and its argument.
+
+    Returns:
+        tuple: result of function and collected `Timings`.
+    """
+    function, argument = job
+    with collect() as timings:
+        return function(argument), timings
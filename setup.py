@@ -10,6 +10,7 @@ with open('README.rst') as readme_file:
 
 requirements = [
     'Click>=6.0',
+    'requests',
     # TODO: put package requirements here
 ]
 
@@ -37,8 +38,10 @@ setup(
             'rpmlint_list=rpmlint_list.cli:main'
         ]
     },
+    package_data={'rpmlint_list': ['static/*']},
     include_package_data=True,
     install_requires=requirements,
+    python_requires='>=3.7',
     license="Apache Software License 2.0",
     zip_safe=False,
     keywords='rpmlint_list',
@@ -47,13 +50,13 @@ setup(
         'Intended Audience :: Developers',
         'License :: OSI Approved :: Apache Software License',
         'Natural Language :: English',
-        "Programming Language :: Python :: 2",
-        'Programming Language :: Python :: 2.6',
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.3',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
+        'Programming Language :: Python :: 3 :: Only',
+        'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
     ],
     test_suite='tests',
     tests_require=test_requirements,
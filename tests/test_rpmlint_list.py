@@ -3,12 +3,45 @@
 
 """Tests for `rpmlint_list` package."""
 
+import gzip
+import io
+import json
+import lzma
+import os
+import pickle
+import subprocess
+import sys
+import threading
+import time
+
 import pytest
+import requests
 
 from click.testing import CliRunner
+from http.server import BaseHTTPRequestHandler, HTTPServer
 
 from rpmlint_list import rpmlint_list
+from rpmlint_list import html as rpmlint_list_html
+from rpmlint_list import cache
 from rpmlint_list import cli
+from rpmlint_list import index
+from rpmlint_list import server
+from rpmlint_list import store
+from rpmlint_list import timing
+
+REPORT = b"""<?xml version="1.0" encoding="UTF-8"?>
+<testsuite>
+  <testcase name="foo">
+    <failure>foo.x86_64: E: zero-length /usr/share/foo/empty
+foo.x86_64: W: no-documentation ---
+foo-devel.x86_64: W: no-documentation ---</failure>
+  </testcase>
+  <testcase name="bar"/>
+  <testcase name="baz">
+    <failure>baz.noarch: E: non-standard-dir-perm /usr/share/baz 775</failure>
+  </testcase>
+</testsuite>
+"""
 
 
 @pytest.fixture
@@ -36,3 +69,788 @@ def test_command_line_interface():
     help_result = runner.invoke(cli.main, ['--help'])
     assert help_result.exit_code == 0
     assert '--help  Show this message and exit.' in help_result.output
+
+
+def test_parse_report():
+    errors = list(rpmlint_list.parse_report(io.BytesIO(REPORT)))
+    assert errors == [
+        ("foo.x86_64", "E", "zero-length", "/usr/share/foo/empty"),
+        ("foo.x86_64", "W", "no-documentation", "-"),
+        ("foo-devel.x86_64", "W", "no-documentation", "-"),
+        ("baz.noarch", "E", "non-standard-dir-perm", "/usr/share/baz 775"),
+    ]
+
+
+def test_parse_report_is_lazy():
+    errors = rpmlint_list.parse_report(io.BytesIO(REPORT))
+    assert next(errors) == (
+        "foo.x86_64", "E", "zero-length", "/usr/share/foo/empty")
+
+
+@pytest.mark.parametrize("line,expected", [
+    ("foo: E: no-binary /usr/lib/foo",
+     ("foo", "E", "no-binary", "/usr/lib/foo")),
+    ("foo.x86_64: W: no-documentation",
+     ("foo.x86_64", "W", "no-documentation", "-")),
+    ("foo.noarch: W: summary-ended-with-dot ---",
+     ("foo.noarch", "W", "summary-ended-with-dot", "-")),
+    ("foo.src: W: strange-permission foo.spec: 775",
+     ("foo.src", "W", "strange-permission", "foo.spec: 775")),
+    ("2 packages and 0 specfiles checked; 1 errors, 1 warnings.", None),
+    ("", None),
+])
+def test_parse_error_line(line, expected):
+    assert rpmlint_list.parse_error_line(line) == expected
+
+
+def test_iter_error_lists_merges_sources(tmpdir):
+    for arch in ("x86_64", "aarch64"):
+        tmpdir.join("{}.xml".format(arch)).write_binary(
+            REPORT.replace(b"x86_64", arch.encode()))
+    pattern = str(tmpdir.join("*.xml"))
+    errors = list(rpmlint_list.iter_error_lists([pattern], workers=2))
+    assert len(errors) == 8
+    assert ("foo.aarch64", "E", "zero-length", "/usr/share/foo/empty",
+            str(tmpdir.join("aarch64.xml"))) in errors
+    error_dictionary = rpmlint_list.get_error_dictionary(errors)
+    assert error_dictionary["Error"]["non-standard-dir-perm"]["sources"] == {
+        "baz.noarch": [str(tmpdir.join("aarch64.xml")),
+                       str(tmpdir.join("x86_64.xml"))]}
+
+
+def test_command_line_json(tmpdir):
+    report = tmpdir.join("report.xml")
+    report.write_binary(REPORT)
+    result = CliRunner().invoke(cli.main, ["-f", "json", str(report)])
+    assert result.exit_code == 0
+    assert json.loads(result.output)["Warning"]["no-documentation"] == {
+        "detail": {"-": ["foo.x86_64", "foo-devel.x86_64"]},
+        "priority": None}
+
+
+@pytest.mark.parametrize("name,compress", [
+    ("report.xml", lambda x: x),
+    ("report.xml.gz", gzip.compress),
+    ("report.xml.xz", lzma.compress),
+])
+def test_iter_error_list_local_file(tmpdir, name, compress):
+    report = tmpdir.join(name)
+    report.write_binary(compress(REPORT))
+    expected = list(rpmlint_list.parse_report(io.BytesIO(REPORT)))
+    assert rpmlint_list.get_error_list(str(report)) == expected
+    assert rpmlint_list.get_error_list("file://" + str(report)) == expected
+
+
+def test_error_index_matches_error_dictionary():
+    errors = list(rpmlint_list.parse_report(io.BytesIO(REPORT)))
+    errors.append(("foo.x86_64", "W", "no-documentation", "-", "x86_64"))
+    priority_info = {"zero-length": "5"}
+    index = rpmlint_list.get_error_index(errors, priority_info)
+    assert index.to_dict() == rpmlint_list.get_error_dictionary(
+        errors, priority_info)
+    assert index.get_priority("Error", "zero-length") == "5"
+    assert index.get_priority("Warning", "no-documentation") == 0
+    assert index.get_details("Warning", "no-documentation") == {
+        "-": ["foo.x86_64", "foo-devel.x86_64", "foo.x86_64"]}
+    with pytest.raises(KeyError):
+        index.get_details("Error", "no-documentation")
+
+
+@pytest.mark.parametrize("package,expected", [
+    ("foo.x86_64", "foo"),
+    ("foo-devel.x86_64", "foo"),
+    ("foo-libs-devel", "foo"),
+    ("python3-foo.noarch", "python3-foo"),
+    ("foo-1.2", "foo-1.2"),
+])
+def test_get_source_package_name(package, expected):
+    assert index.get_source_package_name(package) == expected
+
+
+def test_error_index_by_package():
+    errors = list(rpmlint_list.parse_report(io.BytesIO(REPORT)))
+    error_index = rpmlint_list.get_error_index(errors)
+    assert error_index.get_package_errors("foo.x86_64") == [
+        ("Error", "zero-length", "/usr/share/foo/empty"),
+        ("Warning", "no-documentation", "-")]
+    assert error_index.get_binary_packages("foo") == [
+        "foo.x86_64", "foo-devel.x86_64"]
+    assert error_index.to_package_dict() ==\
+        rpmlint_list.get_package_dictionary(error_index.to_dict())
+    assert error_index.to_package_dict()["foo-devel.x86_64"] == {
+        "source_package": "foo",
+        "errors": {"Warning": {"no-documentation": ["-"]}}}
+
+
+def test_write_html_list():
+    error_dictionary = rpmlint_list.get_error_dictionary(
+        rpmlint_list.parse_report(io.BytesIO(REPORT)))
+    generator = rpmlint_list.HTMLGenerator(error_dictionary)
+    stream = io.StringIO()
+    generator.write_html_list(stream)
+    assert stream.getvalue() == generator.generate_html_list()
+    assert "<li>foo-devel.x86_64</li>" in stream.getvalue()
+
+
+def test_generate_details_incremental(tmpdir):
+    errors = list(rpmlint_list.parse_report(io.BytesIO(REPORT)))
+    error_dictionary = rpmlint_list.get_error_dictionary(errors)
+    generator = rpmlint_list.HTMLGenerator(error_dictionary)
+    written = generator.generate_details(
+        error_dictionary, str(tmpdir), workers=2, incremental=True)
+    assert sorted(written) == [
+        "error/non-standard-dir-perm.html", "error/zero-length.html",
+        "packages/baz.noarch.html", "packages/foo-devel.x86_64.html",
+        "packages/foo.x86_64.html", "warning/no-documentation.html"]
+    assert tmpdir.join("warning", "no-documentation.html").check()
+    assert generator.generate_details(
+        error_dictionary, str(tmpdir), incremental=True) == []
+
+    errors.pop()
+    error_dictionary = rpmlint_list.get_error_dictionary(errors)
+    written = generator.generate_details(
+        error_dictionary, str(tmpdir), workers=1, incremental=True)
+    assert written == []
+    assert not tmpdir.join("error", "non-standard-dir-perm.html").check()
+    assert not tmpdir.join("packages", "baz.noarch.html").check()
+
+
+def test_generate_details_pages(tmpdir):
+    errors = list(rpmlint_list.parse_report(io.BytesIO(REPORT)))
+    errors.append(("bar.noarch", "W", "no-documentation", "-"))
+    error_dictionary = rpmlint_list.get_error_dictionary(errors)
+    parts = rpmlint_list.split_error_info(
+        error_dictionary["Warning"]["no-documentation"], 2)
+    assert [x["detail"] for x in parts] == [
+        {"-": ["foo.x86_64", "foo-devel.x86_64"]}, {"-": ["bar.noarch"]}]
+    parts = rpmlint_list.split_error_info(dict(
+        error_dictionary["Warning"]["no-documentation"],
+        sources={"foo.x86_64": ["a.xml"], "bar.noarch": ["b.xml"]},
+        package_priorities={"bar.noarch": "3"}), 2)
+    assert [sorted(x) for x in parts] == [
+        ["detail", "priority"], ["detail", "package_priorities", "priority"]]
+    assert parts[1]["package_priorities"] == {"bar.noarch": "3"}
+    generator = rpmlint_list.HTMLGenerator(error_dictionary)
+    generator.generate_details(error_dictionary, str(tmpdir), page_size=2)
+    first = tmpdir.join("warning", "no-documentation.html").read()
+    assert "Page 1 of 2" in first
+    assert "href='no-documentation-page2.html'" in first
+    assert "bar.noarch" in tmpdir.join(
+        "warning", "no-documentation-page2.html").read()
+    assert "Page" not in tmpdir.join("error", "zero-length.html").read()
+
+    generator.generate_details(
+        error_dictionary, str(tmpdir), incremental=True, page_size=3)
+    assert not tmpdir.join("warning", "no-documentation-page2.html").check()
+
+    generator.generate_details(error_dictionary, str(tmpdir), page_size=2)
+    assert tmpdir.join("warning", "no-documentation-page2.html").check()
+    generator.generate_details(error_dictionary, str(tmpdir), page_size=3)
+    assert not tmpdir.join("warning", "no-documentation-page2.html").check()
+
+
+def test_write_search_index(tmpdir):
+    errors = list(rpmlint_list.parse_report(io.BytesIO(REPORT)))
+    error_dictionary = rpmlint_list.get_error_dictionary(errors)
+    tags, shards = rpmlint_list.get_search_index(
+        error_dictionary, rpmlint_list.get_package_dictionary(
+            error_dictionary),
+        rpmlint_list.HTMLGenerator({}).get_error_page)
+    assert tags[0] == [
+        "Error", "non-standard-dir-perm", "error/non-standard-dir-perm.html"]
+    assert sorted(shards) == ["ba", "fo"]
+    assert shards["fo"]["foo.x86_64"] == [1, 2]
+    assert rpmlint_list.get_search_shard_name("R-Foo") == "r_"
+
+    generator = rpmlint_list.HTMLGenerator(error_dictionary)
+    generator.generate_details(error_dictionary, str(tmpdir))
+    assert tmpdir.join("search.html").check()
+    assert sorted(tmpdir.join("search").listdir()) == [
+        tmpdir.join("search", x) for x in ("ba.js", "fo.js", "tags.js")]
+    assert json.loads(tmpdir.join("search", "ba.js").read()[
+        len('rpmlintSearch.load("ba", '):-3]) == {"baz.noarch": [0]}
+
+    errors.pop()
+    error_dictionary = rpmlint_list.get_error_dictionary(errors)
+    generator.generate_details(error_dictionary, str(tmpdir))
+    assert not tmpdir.join("search", "ba.js").check()
+
+
+def test_copy_sources(tmpdir):
+    generator = rpmlint_list.HTMLGenerator({})
+    generator.copy_sources(str(tmpdir))
+    generator.copy_sources(str(tmpdir))
+    for name in rpmlint_list.SOURCES:
+        assert tmpdir.join("sources", name).read() == open(os.path.join(
+            rpmlint_list.STATIC_DIRECTORY, name)).read()
+
+
+def test_get_cached_error_index(tmpdir, monkeypatch):
+    report = tmpdir.join("report.xml")
+    report.write_binary(REPORT)
+    report_cache = cache.ReportCache(str(tmpdir.join("cache")))
+    error_index = rpmlint_list.get_cached_error_index(
+        [str(report)], report_cache)
+    assert error_index.to_dict() == rpmlint_list.get_error_dictionary(
+        rpmlint_list.get_error_list(str(report)))
+
+    def fail(*args):
+        raise AssertionError("report was parsed again")
+    monkeypatch.setattr(rpmlint_list, "parse_report", fail)
+    assert rpmlint_list.get_cached_error_index(
+        [str(report)], report_cache).to_dict() == error_index.to_dict()
+
+
+def test_report_cache_eviction(tmpdir):
+    report_cache = cache.ReportCache(str(tmpdir), max_size=0)
+    report_cache.store("key", {"sha256": "0"}, index.ErrorIndex())
+    assert report_cache.get_validators("key") is None
+    assert tmpdir.listdir() == []
+    assert report_cache.load("key") is None
+    report_cache.evict()
+
+
+def test_incompatible_index(tmpdir, monkeypatch):
+    error_index = rpmlint_list.get_error_index(
+        rpmlint_list.parse_report(io.BytesIO(REPORT)))
+    # Index pickled without version of its format by older versions.
+    with open(str(tmpdir.join("index")), "wb") as index_file:
+        pickle.dump(error_index, index_file)
+    with pytest.raises(ValueError):
+        index.ErrorIndex.load(str(tmpdir.join("index")))
+    tmpdir.join("build.xml").write_binary(REPORT)
+    result = CliRunner().invoke(cli.main, [
+        "update", str(tmpdir.join("index")), str(tmpdir.join("build.xml"))])
+    assert result.exit_code == 2
+    assert "incompatible format" in result.output
+
+    report_cache = cache.ReportCache(str(tmpdir.join("cache")))
+    key = report_cache.get_key("a.xml")
+    monkeypatch.setattr(cache, "INDEX_FORMAT", index.INDEX_FORMAT + 1)
+    assert report_cache.get_key("a.xml") != key
+    report_cache.store("key", {"sha256": "0"}, error_index)
+    tmpdir.join("cache", "key.pickle").write_binary(b"garbage")
+    assert report_cache.load("key") is None
+
+
+def test_get_cached_error_index_eviction(tmpdir):
+    tmpdir.join("a.xml").write_binary(REPORT)
+    tmpdir.join("b.xml").write_binary(REPORT)
+    report_cache = cache.ReportCache(str(tmpdir.join("cache")), max_size=0)
+    error_index = rpmlint_list.get_cached_error_index(
+        [str(tmpdir.join("*.xml"))], report_cache, workers=2)
+    assert len(list(error_index.iter_errors())) == 8
+    assert tmpdir.join("cache").listdir() == []
+
+    report_cache.max_size = cache.DEFAULT_MAX_SIZE
+    rpmlint_list.get_cached_error_index(
+        [str(tmpdir.join("a.xml"))], report_cache)
+    # Entry evicted by other process between reading validators and index.
+    report_cache.load = lambda key: None
+    assert rpmlint_list.get_cached_error_index(
+        [str(tmpdir.join("a.xml"))], report_cache).to_dict() ==\
+        rpmlint_list.get_error_dictionary(
+            rpmlint_list.get_error_list(str(tmpdir.join("a.xml"))))
+
+
+def test_get_error_diff():
+    old_errors = list(rpmlint_list.parse_report(io.BytesIO(REPORT)))
+    new_errors = old_errors[1:] + [
+        ("qux.noarch", "W", "no-documentation", "-")]
+    error_diff = rpmlint_list.get_error_diff(old_errors, iter(new_errors))
+    assert error_diff == {
+        "added": {"Warning": {"no-documentation": {
+            "detail": {"-": ["qux.noarch"]}, "priority": None}}},
+        "removed": {"Error": {"zero-length": {
+            "detail": {"/usr/share/foo/empty": ["foo.x86_64"]},
+            "priority": None}}},
+        "unchanged": 3}
+
+
+def test_command_line_diff(tmpdir):
+    tmpdir.join("old.xml").write_binary(REPORT)
+    tmpdir.join("new.xml").write_binary(REPORT.replace(b"baz", b"qux"))
+    result = CliRunner().invoke(cli.main, [
+        "diff", "-f", "package_json",
+        str(tmpdir.join("old.xml")), str(tmpdir.join("new.xml"))])
+    assert result.exit_code == 0
+    error_diff = json.loads(result.output)
+    assert list(error_diff["added"]) == ["qux.noarch"]
+    assert list(error_diff["removed"]) == ["baz.noarch"]
+    assert error_diff["unchanged"] == 3
+
+
+def test_error_index_replace_packages(tmpdir):
+    errors = list(rpmlint_list.parse_report(io.BytesIO(REPORT)))
+    error_index = rpmlint_list.get_error_index(errors)
+    error_index.save(str(tmpdir.join("index")))
+    error_index = index.ErrorIndex.load(str(tmpdir.join("index")))
+    changed_errors, packages = error_index.replace_packages([
+        ("foo.x86_64", "W", "no-manual-page-for-binary", "foo")])
+    assert changed_errors == {
+        ("Error", "zero-length"), ("Warning", "no-documentation"),
+        ("Warning", "no-manual-page-for-binary")}
+    assert packages == {"foo.x86_64"}
+    assert error_index.to_dict() == rpmlint_list.get_error_dictionary(
+        errors[2:] + [("foo.x86_64", "W", "no-manual-page-for-binary",
+                       "foo")])
+    assert error_index.get_binary_packages("foo") == [
+        "foo-devel.x86_64", "foo.x86_64"]
+
+
+def test_command_line_update(tmpdir):
+    tmpdir.join("report.xml").write_binary(REPORT)
+    tmpdir.join("build.xml").write_binary(REPORT.replace(
+        b"baz.noarch: E: non-standard-dir-perm",
+        b"baz.noarch: W: non-standard-dir-perm"))
+    details = tmpdir.mkdir("details")
+    runner = CliRunner()
+    result = runner.invoke(cli.main, [
+        "-s", str(tmpdir.join("index")), "-d", str(details), "-j", "1",
+        str(tmpdir.join("report.xml"))])
+    assert result.exit_code == 0
+    assert details.join("error", "non-standard-dir-perm.html").check()
+    result = runner.invoke(cli.main, [
+        "update", "-d", str(details), "-j", "1", str(tmpdir.join("index")),
+        str(tmpdir.join("build.xml"))])
+    assert result.exit_code == 0
+    assert not details.join("error", "non-standard-dir-perm.html").check()
+    assert details.join("warning", "non-standard-dir-perm.html").check()
+    error_index = index.ErrorIndex.load(str(tmpdir.join("index")))
+    assert error_index.get_package_errors("baz.noarch") == [
+        ("Warning", "non-standard-dir-perm", "/usr/share/baz 775")]
+
+
+def test_command_line_update_cleared_package(tmpdir):
+    tmpdir.join("report.xml").write_binary(REPORT)
+    tmpdir.join("build.xml").write_binary(
+        b'<?xml version="1.0" encoding="UTF-8"?>\n'
+        b'<testsuite><testcase name="foo"/></testsuite>\n')
+    details = tmpdir.mkdir("details")
+    runner = CliRunner()
+    result = runner.invoke(cli.main, [
+        "-s", str(tmpdir.join("index")), "-d", str(details), "-j", "1",
+        str(tmpdir.join("report.xml"))])
+    assert result.exit_code == 0
+    result = runner.invoke(cli.main, [
+        "update", "-d", str(details), "-j", "1", str(tmpdir.join("index")),
+        str(tmpdir.join("build.xml"))])
+    assert result.exit_code == 0
+    error_index = index.ErrorIndex.load(str(tmpdir.join("index")))
+    assert error_index.get_packages() == ["baz.noarch"]
+    assert not details.join("packages", "foo.x86_64.html").check()
+    assert not details.join("error", "zero-length.html").check()
+    assert "foo" not in details.join("packages", "index.html").read()
+    assert "zero-length" not in details.join("index.html").read()
+    assert not details.join("search", "fo.js").check()
+    assert details.join("search", "tags.js").read() ==\
+        'rpmlintSearch.tags([["Error","non-standard-dir-perm",'\
+        '"error/non-standard-dir-perm.html"]]);\n'
+    assert details.join("search", "ba.js").read() ==\
+        'rpmlintSearch.load("ba", {"baz.noarch":[0]});\n'
+
+
+def test_replace_packages_of_testcases():
+    testcases = {}
+    errors = list(rpmlint_list.parse_report(io.BytesIO(REPORT), testcases))
+    assert testcases == {
+        "foo": {"foo.x86_64", "foo-devel.x86_64"}, "bar": set(),
+        "baz": {"baz.noarch"}}
+    errors.append(("kernel-tools.x86_64", "W", "no-documentation", "-"))
+    error_index = rpmlint_list.get_error_index(
+        errors, testcases=dict(testcases, **{
+            "kernel-tools": {"kernel-tools.x86_64"}}))
+    changed_errors, packages = error_index.replace_packages(
+        [("kernel.x86_64", "W", "no-documentation", "-")],
+        {"kernel": {"kernel.x86_64"}, "foo": set()})
+    assert packages == {"kernel.x86_64", "foo.x86_64", "foo-devel.x86_64"}
+    assert error_index.get_packages() == [
+        "baz.noarch", "kernel-tools.x86_64", "kernel.x86_64"]
+    assert error_index.get_testcases()["foo"] == []
+
+
+def test_command_line_update_priorities(tmpdir):
+    tmpdir.join("report.xml").write_binary(REPORT)
+    tmpdir.join("build.xml").write_binary(REPORT.replace(
+        b'<testcase name="baz">', b'<testcase name="qux">').replace(
+        b"baz.noarch", b"qux.noarch"))
+    tmpdir.join("priority").write(
+        "zero-length 1\nno-documentation 2\nfoo-devel*/no-documentation 3\n")
+    details = tmpdir.mkdir("details")
+    runner = CliRunner()
+    result = runner.invoke(cli.main, [
+        "-s", str(tmpdir.join("index")), str(tmpdir.join("report.xml"))])
+    assert result.exit_code == 0
+    result = runner.invoke(cli.main, [
+        "update", "-d", str(details), "-j", "1",
+        "-p", str(tmpdir.join("priority")), str(tmpdir.join("index")),
+        str(tmpdir.join("build.xml"))])
+    assert result.exit_code == 0
+    error_index = index.ErrorIndex.load(str(tmpdir.join("index")))
+    assert error_index.get_priority("Error", "zero-length") == "1"
+    assert error_index.get_priority("Warning", "no-documentation") == "2"
+    assert error_index.get_package_priorities(
+        "Warning", "no-documentation") == {"foo-devel.x86_64": "3"}
+    assert error_index.get_priority("Error", "non-standard-dir-perm") == 0
+    assert "<th>Priority:</th><td>1</td>" in details.join(
+        "error", "zero-length.html").read()
+
+
+def test_update_index_with_sources():
+    errors = list(rpmlint_list.parse_report(io.BytesIO(REPORT)))
+    error_index = rpmlint_list.get_error_index(
+        [x + ("a.xml",) for x in errors[:2]] +
+        [x + ("b.xml",) for x in errors[2:]])
+    error_index.replace_packages([
+        ("qux.noarch", "W", "no-documentation", "-")])
+    assert len(list(error_index.iter_errors())) == 5
+    assert error_index.get_sources("Warning", "no-documentation") == {
+        "foo.x86_64": ["a.xml"], "foo-devel.x86_64": ["b.xml"]}
+    assert ("qux.noarch", "Warning", "no-documentation", "-") in\
+        list(error_index.iter_errors())
+
+    error_index = rpmlint_list.get_error_index(errors)
+    error_index.replace_packages([
+        ("qux.noarch", "W", "no-documentation", "-", "c.xml")])
+    assert ("qux.noarch", "Warning", "no-documentation", "-", "c.xml") in\
+        list(error_index.iter_errors())
+    assert error_index.get_sources("Warning", "no-documentation") == {
+        "qux.noarch": ["c.xml"]}
+
+
+def test_sqlite_store(tmpdir):
+    error_index = rpmlint_list.get_error_index(
+        rpmlint_list.parse_report(io.BytesIO(REPORT)), {"zero-length": "3"})
+    with store.SQLiteStore(str(tmpdir.join("findings.db"))) as sqlite_store:
+        sqlite_store.write(error_index)
+        sqlite_store.write(error_index)
+        assert sqlite_store.get_packages("no-documentation") == [
+            "foo-devel.x86_64", "foo.x86_64"]
+        assert sqlite_store.get_package_errors("foo.x86_64") == [
+            ("Error", "zero-length", "/usr/share/foo/empty"),
+            ("Warning", "no-documentation", "-")]
+        assert sqlite_store.get_top_errors(2) == [
+            ("Warning", "no-documentation", 2),
+            ("Error", "non-standard-dir-perm", 1)]
+
+
+def test_command_line_query(tmpdir):
+    tmpdir.join("report.xml").write_binary(REPORT)
+    database = str(tmpdir.join("findings.db"))
+    runner = CliRunner()
+    result = runner.invoke(cli.main, [
+        "--sqlite_path", database, str(tmpdir.join("report.xml"))])
+    assert result.exit_code == 0
+    result = runner.invoke(cli.main, [
+        "query", "--error", "no-documentation", database])
+    assert result.output == "foo-devel.x86_64\nfoo.x86_64\n"
+
+
+def test_command_line_ndjson(tmpdir):
+    report = tmpdir.join("report.xml")
+    report.write_binary(REPORT)
+    result = CliRunner().invoke(cli.main, ["-f", "ndjson", str(report)])
+    assert result.exit_code == 0
+    records = [json.loads(x) for x in result.output.splitlines()]
+    assert len(records) == 4
+    assert records[0] == {
+        "package": "foo.x86_64", "severity": "Error", "tag": "zero-length",
+        "detail": "/usr/share/foo/empty", "priority": None}
+
+
+def test_timing_collect():
+    with timing.collect() as timings:
+        rpmlint_list.get_error_index(
+            rpmlint_list.parse_report(io.BytesIO(REPORT)))
+    assert timings.counters == {"findings": 4}
+    assert timings.stages == ["parse"]
+    timing.count("findings")
+    assert timings.counters == {"findings": 4}
+
+
+def test_command_line_timings(tmpdir):
+    report = tmpdir.join("report.xml")
+    report.write_binary(REPORT)
+    tmpdir.mkdir("details")
+    result = CliRunner().invoke(cli.main, [
+        "--timings_json", str(tmpdir.join("timings.json")),
+        "--profile", str(tmpdir.join("profile")),
+        "-d", str(tmpdir.join("details")), str(report)])
+    assert result.exit_code == 0
+    record = json.loads(tmpdir.join("timings.json").read())
+    assert sorted(record["stages"]) == [
+        "details", "dictionary", "output", "parse"]
+    assert record["counters"]["findings"] == 4
+    assert record["counters"]["files_written"] == 13
+    assert tmpdir.join("profile").check()
+
+
+def test_error_index_summary():
+    errors = list(rpmlint_list.parse_report(io.BytesIO(REPORT)))
+    errors.append(("foo.x86_64", "W", "no-documentation", "/usr/bin/foo"))
+    error_index = rpmlint_list.get_error_index(errors)
+    summary = error_index.get_summary(top=1)
+    assert summary["errors"]["Warning"]["no-documentation"] == {
+        "packages": 2, "occurrences": 3, "details": 2, "priority": None}
+    assert summary["errors"]["Warning"]["no-documentation"] ==\
+        rpmlint_list.get_error_statistics(
+            error_index.to_dict()["Warning"]["no-documentation"])
+    assert summary["severities"] == {
+        "Error": {"errors": 2, "occurrences": 2},
+        "Warning": {"errors": 1, "occurrences": 3}}
+    assert summary["top_packages"] == [("foo.x86_64", 3)]
+    error_index.remove_packages(["foo.x86_64"])
+    assert error_index.get_statistics("Warning", "no-documentation")[
+        "packages"] == 1
+
+
+def test_priority_rules(tmpdir):
+    tmpdir.join("priority").write(
+        "# comment\n"
+        "zero-length 1\n"
+        "\n"
+        "*-without-* 2\n"
+        "re:non-standard-(dir|file)-perm 3\n"
+        "no-* 4\n"
+        "foo*/no-documentation 5\n")
+    rules = rpmlint_list.load_priority_info(str(tmpdir.join("priority")))
+    assert rules["zero-length"] == "1"
+    assert rules["devel-file-without-library"] == "2"
+    assert rules["non-standard-dir-perm"] == "3"
+    assert rules["no-documentation"] == "4"
+    assert "non-standard-uid" not in rules
+    assert rules.get_priority("no-documentation", "foo-devel") == "5"
+    assert rules.get_priority("no-documentation", "bar") == "4"
+    assert pickle.loads(pickle.dumps(rules))["no-binary"] == "4"
+    for package in range(100):
+        for tag in ("no-documentation", "zero-length", "no-binary"):
+            rules.get_priority(tag, "foo{}".format(package))
+    # Memoized per package and per error, not per package and error.
+    assert len(rules.package_cache) == 102
+    assert len(rules.rule_sets) == 2
+    assert len(rules.cache) == 5
+    error_index = rpmlint_list.get_error_index(
+        rpmlint_list.parse_report(io.BytesIO(REPORT)), rules)
+    assert error_index.get_priority("Error", "non-standard-dir-perm") == "3"
+
+
+def test_package_priority_rules(tmpdir):
+    tmpdir.join("priority").write(
+        "foo-devel*/no-documentation 9\nno-documentation 1\n")
+    tmpdir.join("report.xml").write_binary(REPORT)
+    arguments = ["-p", str(tmpdir.join("priority")), str(tmpdir.join(
+        "report.xml"))]
+    runner = CliRunner()
+    result = runner.invoke(cli.main, ["-f", "json"] + arguments)
+    error_info = json.loads(result.output)["Warning"]["no-documentation"]
+    assert error_info["priority"] == "1"
+    assert error_info["package_priorities"] == {"foo-devel.x86_64": "9"}
+    assert error_info == rpmlint_list.get_error_dictionary(
+        rpmlint_list.get_error_list(str(tmpdir.join("report.xml"))),
+        rpmlint_list.load_priority_info(str(tmpdir.join("priority"))))[
+            "Warning"]["no-documentation"]
+    assert "foo-devel.x86_64: 9" in rpmlint_list.HTMLGenerator(
+        {}).convert_dictionary_to_table(
+            error_info, "Warning", "no-documentation")
+
+    result = runner.invoke(cli.main, [
+        "--sqlite_path", str(tmpdir.join("findings.db"))] + arguments)
+    assert result.exit_code == 0
+    with store.SQLiteStore(str(tmpdir.join("findings.db"))) as sqlite_store:
+        assert sorted(sqlite_store.connection.execute(
+            "SELECT package, priority FROM findings "
+            "WHERE tag = 'no-documentation'")) == [
+                ("foo-devel.x86_64", "9"), ("foo.x86_64", "1")]
+
+    error_index = rpmlint_list.get_error_index(
+        rpmlint_list.get_error_list(str(tmpdir.join("report.xml"))),
+        rpmlint_list.load_priority_info(str(tmpdir.join("priority"))))
+    error_index.remove_packages(["foo-devel.x86_64"])
+    assert error_index.get_package_priorities(
+        "Warning", "no-documentation") is None
+
+
+def test_index_server(tmpdir):
+    report = tmpdir.join("report.xml")
+    report.write_binary(REPORT)
+    details = tmpdir.mkdir("details")
+
+    def load():
+        error_index = rpmlint_list.get_error_index(
+            rpmlint_list.iter_error_list(str(report)))
+        error_dictionary = error_index.to_dict()
+        rpmlint_list.HTMLGenerator(error_dictionary).generate_details(
+            error_dictionary, str(details), workers=1)
+        return error_index
+
+    holder = server.IndexHolder(load)
+    index_server = server.IndexServer(
+        ("127.0.0.1", 0), holder, str(details), quiet=True)
+    thread = threading.Thread(target=index_server.serve_forever)
+    thread.start()
+    url = "http://127.0.0.1:{}/".format(index_server.server_address[1])
+    try:
+        response = requests.get(url + "api/tag/zero-length")
+        assert response.json()["Error"]["detail"] == {
+            "/usr/share/foo/empty": ["foo.x86_64"]}
+        assert requests.get(url + "api/package/baz.noarch").json() == {
+            "source_package": "baz",
+            "errors": {"Error": {"non-standard-dir-perm": [
+                "/usr/share/baz 775"]}}}
+        assert requests.get(url + "api/package/qux").status_code == 404
+        assert sorted(requests.get(url + "api/severity/Error").json()) == [
+            "non-standard-dir-perm", "zero-length"]
+        etag = response.headers["ETag"]
+        assert requests.get(url + "api/tag/zero-length", headers={
+            "If-None-Match": etag}).status_code == 304
+
+        response = requests.get(url)
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "zero-length" in response.text
+
+        report.write_binary(REPORT.replace(b"zero-length", b"empty-file"))
+        holder.refresh()
+        assert requests.get(url + "api/tag/zero-length", headers={
+            "If-None-Match": etag}).status_code == 404
+        assert requests.get(url + "api/summary").json()["errors"][
+            "Error"]["empty-file"]["packages"] == 1
+    finally:
+        index_server.shutdown()
+        index_server.server_close()
+        thread.join()
+
+
+def test_generate_served_details(tmpdir):
+    report = tmpdir.join("report.xml")
+    report.write_binary(REPORT)
+    details = tmpdir.join("details")
+
+    def load():
+        error_index = rpmlint_list.get_error_index(
+            rpmlint_list.iter_error_list(str(report)))
+        return error_index, cli.generate_served_details(
+            error_index, str(details), workers=1)
+
+    holder = server.IndexHolder(load)
+    first = holder.snapshot.directory
+    assert details.islink() and details.realpath() == first
+    index_server = server.IndexServer(("127.0.0.1", 0), holder, quiet=True)
+    thread = threading.Thread(target=index_server.serve_forever)
+    thread.start()
+    url = "http://127.0.0.1:{}/".format(index_server.server_address[1])
+    try:
+        assert "zero-length" in requests.get(url).text
+        report.write_binary(REPORT.replace(b"zero-length", b"empty-file"))
+        holder.refresh()
+        second = holder.snapshot.directory
+        assert second != first and details.realpath() == second
+        assert "empty-file" in requests.get(url).text
+        assert requests.get(url + "error/zero-length.html").status_code ==\
+            404
+        # Previous directory is kept for running requests.
+        assert os.path.exists(os.path.join(first, "error", "zero-length.html"))
+        holder.refresh()
+        assert not os.path.exists(first)
+        assert sorted(x.basename for x in tmpdir.listdir()) == sorted([
+            "details", "report.xml", os.path.basename(second),
+            os.path.basename(holder.snapshot.directory)])
+    finally:
+        index_server.shutdown()
+        index_server.server_close()
+        thread.join()
+
+
+def test_index_holder_reload():
+    loaded = []
+    reloaded = threading.Event()
+
+    def load():
+        loaded.append(index.ErrorIndex())
+        if len(loaded) > 1:
+            reloaded.set()
+        return loaded[-1]
+
+    holder = server.IndexHolder(load, 0.01)
+    holder.start()
+    assert reloaded.wait(5)
+    holder.stop()
+    assert holder.snapshot.error_index is loaded[-1]
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Fails the first request, then sends gzip encoded report slowly."""
+    requests = 0
+    delay = 0
+
+    def do_GET(self):
+        FlakyHandler.requests += 1
+        if FlakyHandler.requests == 1:
+            self.send_error(503)
+            return
+        body = gzip.compress(REPORT)
+        self.send_response(200)
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        time.sleep(self.delay)
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def flaky_url():
+    FlakyHandler.requests = 0
+    http_server = HTTPServer(("127.0.0.1", 0), FlakyHandler)
+    thread = threading.Thread(target=http_server.serve_forever)
+    thread.start()
+    yield "http://127.0.0.1:{}/report.xml".format(
+        http_server.server_address[1])
+    rpmlint_list.set_fetch_options()
+    http_server.shutdown()
+    http_server.server_close()
+    thread.join()
+
+
+def test_fetch_retries(flaky_url):
+    rpmlint_list.set_fetch_options(retries=1)
+    assert len(rpmlint_list.get_error_list(flaky_url)) == 4
+    assert FlakyHandler.requests == 2
+
+
+def test_fetch_timeout(flaky_url, monkeypatch):
+    monkeypatch.setattr(FlakyHandler, "delay", 1)
+    rpmlint_list.set_fetch_options(timeout=0.1, retries=0)
+    with pytest.raises(requests.exceptions.HTTPError):
+        rpmlint_list.get_error_list(flaky_url)
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        rpmlint_list.get_error_list(flaky_url)
+
+
+def test_stdin_with_other_reports(tmpdir):
+    tmpdir.join("other.xml").write_binary(REPORT.replace(b"foo", b"qux"))
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for options in (["-f", "ndjson"], ["-f", "summary", "-c",
+                                       str(tmpdir.join("cache"))]):
+        process = subprocess.Popen(
+            [sys.executable, "-m", "rpmlint_list.cli"] + options +
+            ["-j", "2", "-", str(tmpdir.join("other.xml"))],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            env=dict(os.environ, PYTHONPATH=root))
+        output = process.communicate(REPORT)[0].decode("utf-8")
+        assert process.returncode == 0
+        assert "foo.x86_64" in output and "qux.x86_64" in output
+
+
+def test_lazy_imports():
+    code = ("import sys, rpmlint_list.cli; print(' '.join(sorted(set(sys."
+            "modules) & {'requests', 'xml.etree.ElementTree', "
+            "'rpmlint_list.html', 'rpmlint_list.server', 'http.server'})))")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.check_output(
+        [sys.executable, "-c", code], env=dict(os.environ, PYTHONPATH=root))
+    assert output.strip() == b""
+    assert isinstance(rpmlint_list.HTMLGenerator({}),
+                      rpmlint_list_html.HTMLGenerator)
+    assert rpmlint_list.MANIFEST is rpmlint_list_html.MANIFEST